@@ -11,9 +11,35 @@ import re
 import emoji as emoji_lib
 
 
+# Split into words (preserve Turkish characters)
+_WORD_RE = re.compile(r'\b[\wğüşıöçĞÜŞİÖÇ]+\b')
+
+# Stop words (common words) - Turkish
+_STOP_WORDS = frozenset({
+    'bir', 'bu', 'şu', 've', 'veya', 'ama', 'fakat', 'için', 'ile', 'mi', 'mu',
+    'mı', 'mü', 'da', 'de', 'ta', 'te', 'ki', 'ne', 'var', 'yok', 'ben', 'sen',
+    'o', 'biz', 'siz', 'onlar', 'the', 'a', 'an', 'and', 'or', 'but', 'is',
+    'are', 'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should'
+})
+
+
 class WhatsAppAnalyzer:
     """Class that analyzes WhatsApp messages"""
     
+    # WhatsApp media_type codes
+    CODE_TO_LABEL = {
+        0: 'Text',
+        1: 'Image',
+        2: 'Audio',
+        3: 'Video',
+        4: 'Contact',       # Contact Card
+        5: 'Location',
+        9: 'Document',
+        13: 'GIF',
+        20: 'Sticker',
+    }
+    
     def __init__(self, messages_df, contacts_df=None, groups_df=None, media_df=None, lid_map_df=None):
         """
         Args:
@@ -29,15 +55,63 @@ class WhatsAppAnalyzer:
         self.media = media_df if media_df is not None else pd.DataFrame()
         self.lid_map = lid_map_df if lid_map_df is not None else pd.DataFrame()
         
-        # Add date columns
+        # Compact dtypes: chat ids repeat a lot, the flags are tiny integer codes
+        if 'chat_id' in self.messages.columns:
+            self.messages['chat_id'] = self.messages['chat_id'].astype('category')
+        if 'from_me' in self.messages.columns:
+            self.messages['from_me'] = self.messages['from_me'].fillna(0).astype('int8')
+        if 'media_type' in self.messages.columns:
+            self.messages['media_type'] = pd.to_numeric(self.messages['media_type'], errors='coerce').astype('Int16')
+        if 'is_group' in self.messages.columns:
+            self.messages['is_group'] = self.messages['is_group'].fillna(False).astype('bool')
+        
+        # Sort once by time (stable) so per-chat row positions are already chronological
         if 'datetime' in self.messages.columns:
-            self.messages['date'] = self.messages['datetime'].dt.date
-            self.messages['year'] = self.messages['datetime'].dt.year
-            self.messages['month'] = self.messages['datetime'].dt.month
-            self.messages['day'] = self.messages['datetime'].dt.day
-            self.messages['hour'] = self.messages['datetime'].dt.hour
-            self.messages['day_of_week'] = self.messages['datetime'].dt.dayofweek
-            self.messages['day_name'] = self.messages['datetime'].dt.day_name()
+            self.messages.sort_values('datetime', kind='mergesort', inplace=True)
+            self.messages.reset_index(drop=True, inplace=True)
+        
+        # chat_id -> row positions of that chat
+        self._chat_slices = {}
+        if 'chat_id' in self.messages.columns:
+            self._chat_slices = self.messages.groupby('chat_id', observed=True, sort=False).indices
+        
+        # Hash lookups for contact name resolution
+        self._lid_map_dict = {}
+        if not self.lid_map.empty and {'lid_jid', 'normal_jid'}.issubset(self.lid_map.columns):
+            lid_map = self.lid_map.drop_duplicates('lid_jid')
+            self._lid_map_dict = dict(zip(lid_map['lid_jid'], lid_map['normal_jid']))
+        self._has_lid_map = bool(self._lid_map_dict)
+        
+        self._contact_name_dict = {}
+        if not self.contacts.empty and 'jid' in self.contacts.columns:
+            contacts = self.contacts.drop_duplicates('jid')
+            names = pd.Series(np.nan, index=contacts.index, dtype=object)
+            # display_name wins when present, given_name is only a fallback for missing ones
+            if 'given_name' in contacts.columns:
+                names = contacts['given_name'].astype(object)
+            if 'display_name' in contacts.columns:
+                names = contacts['display_name'].where(contacts['display_name'].notna(), names)
+            names = names[names.notna()].astype(str)
+            names = names[(names != 'None') & (names.str.strip() != '')]
+            self._contact_name_dict = dict(zip(contacts.loc[names.index, 'jid'], names))
+        
+        # Lazily filled by extract_text_content()
+        self._texts = None
+        self._text_lengths = None
+        
+        # Lazily filled by get_message_type_distribution() / get_general_statistics()
+        self._msg_type_dist = None
+        self._general_stats = None
+        
+        # Add date columns (small ints; day names are only built for the 7-row aggregates)
+        if 'datetime' in self.messages.columns:
+            dt = self.messages['datetime'].dt
+            # NaT rows need the nullable integer types
+            int8, int16 = ('Int8', 'Int16') if self.messages['datetime'].isna().any() else ('int8', 'int16')
+            self.messages['year'] = dt.year.astype(int16)
+            self.messages['month'] = dt.month.astype(int8)
+            self.messages['hour'] = dt.hour.astype(int8)
+            self.messages['day_of_week'] = dt.dayofweek.astype(int8)
     
     def get_contact_name(self, chat_id):
         """Find contact name from chat ID"""
@@ -48,24 +122,13 @@ class WhatsAppAnalyzer:
         original_chat_id = chat_id
         
         # If LID, convert to normal JID first
-        if '@lid' in chat_id and not self.lid_map.empty:
-            if 'lid_jid' in self.lid_map.columns and 'normal_jid' in self.lid_map.columns:
-                lid_row = self.lid_map[self.lid_map['lid_jid'] == chat_id]
-                if not lid_row.empty:
-                    chat_id = lid_row.iloc[0]['normal_jid']
+        if '@lid' in chat_id and self._has_lid_map:
+            chat_id = self._lid_map_dict.get(chat_id, chat_id)
         
-        # Search for contact name
-        if not self.contacts.empty and 'jid' in self.contacts.columns:
-            contact = self.contacts[self.contacts['jid'] == chat_id]
-            if not contact.empty:
-                if 'display_name' in contact.columns and pd.notna(contact.iloc[0]['display_name']):
-                    name = str(contact.iloc[0]['display_name'])
-                    if name and name != 'None' and name.strip():
-                        return name
-                elif 'given_name' in contact.columns and pd.notna(contact.iloc[0]['given_name']):
-                    name = str(contact.iloc[0]['given_name'])
-                    if name and name != 'None' and name.strip():
-                        return name
+        # Search for contact name (empty / 'None' names are dropped when the dict is built)
+        name = self._contact_name_dict.get(chat_id)
+        if name:
+            return name
         
         # Name not found, show phone number
         if '@s.whatsapp.net' in chat_id:
@@ -88,18 +151,60 @@ class WhatsAppAnalyzer:
         
         return chat_id
     
+    @staticmethod
+    def _format_phone(jids):
+        """Vectorized phone fallback of get_contact_name (strip the domain, add + for phone JIDs)"""
+        phones = jids.str.split('@', n=1).str[0]
+        needs_plus = jids.str.contains('@s.whatsapp.net', regex=False) & ~phones.str.startswith('+')
+        return phones.where(~needs_plus, '+' + phones)
+    
+    def _resolve_names_vectorized(self, chat_ids):
+        """Vectorized get_contact_name for a Series of chat IDs"""
+        ids = chat_ids.astype(object)
+        valid = ids.notna()
+        ids = ids[valid].astype(str)
+        
+        # If LID, convert to normal JID first
+        is_lid = ids.str.contains('@lid', regex=False)
+        jids = ids.where(~is_lid, ids.map(self._lid_map_dict).fillna(ids))
+        
+        # Name not found, show phone number
+        fallback = self._format_phone(jids)
+        
+        names = pd.Series("Bilinmeyen", index=chat_ids.index, dtype=object)
+        names[valid] = jids.map(self._contact_name_dict).fillna(fallback)
+        return names
+    
     def get_general_statistics(self):
-        """Genel istatistikleri hesapla"""
+        """Genel istatistikleri hesapla (cached, callers get a copy)"""
+        if self._general_stats is not None:
+            return self._general_stats.copy()
+        
         stats = {}
         
-        # Basic numbers
+        # Basic numbers (plain numpy scans over the compact columns)
         stats['total_messages'] = len(self.messages)
-        stats['total_chats'] = self.messages['chat_id'].nunique()
-        stats['total_media'] = len(self.messages[self.messages['media_type'].notna() & (self.messages['media_type'] > 0)])
+        
+        # chat_id is categorical: count the codes that actually occur (unused categories may exist)
+        chat_ids = self.messages['chat_id']
+        if isinstance(chat_ids.dtype, pd.CategoricalDtype):
+            chat_codes = chat_ids.cat.codes.to_numpy()
+            used_codes = chat_codes[chat_codes >= 0]
+            stats['total_chats'] = int(np.count_nonzero(np.bincount(used_codes, minlength=1)))
+        else:
+            chat_codes = pd.factorize(chat_ids)[0]
+            stats['total_chats'] = chat_ids.nunique()
+        
+        if 'media_type' in self.messages.columns:
+            media_types = self.messages['media_type'].to_numpy(dtype=np.int64, na_value=0)
+            stats['total_media'] = int(np.count_nonzero(media_types > 0))
+        else:
+            stats['total_media'] = 0
         
         # Group vs personal
         if 'is_group' in self.messages.columns:
-            stats['total_groups'] = len(self.messages[self.messages['is_group'] == True]['chat_id'].unique())
+            group_codes = chat_codes[self.messages['is_group'].to_numpy(dtype=bool)]
+            stats['total_groups'] = np.unique(group_codes[group_codes >= 0]).size
             stats['total_personal_chats'] = stats['total_chats'] - stats['total_groups']
         else:
             stats['total_groups'] = 0
@@ -118,20 +223,26 @@ class WhatsAppAnalyzer:
                 stats['date_range_days'] = 0
         
         # Most active day
-        if 'date' in self.messages.columns:
-            most_active_day = self.messages.groupby('date').size().idxmax()
-            stats['most_active_day'] = str(most_active_day)
-            stats['most_active_day_count'] = int(self.messages.groupby('date').size().max())
+        if 'datetime' in self.messages.columns:
+            counts_by_day = self.messages.groupby(self.messages['datetime'].dt.floor('D'), sort=False).size()
+            if not counts_by_day.empty:
+                stats['most_active_day'] = str(counts_by_day.idxmax().date())
+                stats['most_active_day_count'] = int(counts_by_day.max())
         
         # Sent vs received
         if 'from_me' in self.messages.columns:
-            stats['sent_messages'] = int((self.messages['from_me'] == 1).sum())
-            stats['received_messages'] = int((self.messages['from_me'] == 0).sum())
+            from_me = self.messages['from_me'].to_numpy()
+            stats['sent_messages'] = int(np.count_nonzero(from_me == 1))
+            stats['received_messages'] = int(np.count_nonzero(from_me == 0))
         
-        return stats
+        self._general_stats = stats
+        return stats.copy()
     
     def get_message_type_distribution(self):
-        """Message type distribution"""
+        """Message type distribution (cached, callers get a copy)"""
+        if self._msg_type_dist is not None:
+            return self._msg_type_dist.copy()
+        
         distribution = {
             'Text': 0,
             'Image': 0,
@@ -147,44 +258,17 @@ class WhatsAppAnalyzer:
         
         if 'media_type' not in self.messages.columns:
             distribution['Text'] = len(self.messages)
-            return distribution
-        
-        # WhatsApp media_type codes:
-        # 0 or NULL = Text
-        # 1 = Image
-        # 2 = Audio
-        # 3 = Video
-        # 4 = Contact Card
-        # 5 = Location
-        # 13 = GIF
-        # 20 = Sticker
-        # 9 = Document
-        
-        for _, row in self.messages.iterrows():
-            media_type = row.get('media_type')
-            
-            if pd.isna(media_type) or media_type == 0:
-                distribution['Text'] += 1
-            elif media_type == 1:
-                distribution['Image'] += 1
-            elif media_type == 2:
-                distribution['Audio'] += 1
-            elif media_type == 3:
-                distribution['Video'] += 1
-            elif media_type == 4:
-                distribution['Contact'] += 1
-            elif media_type == 5:
-                distribution['Location'] += 1
-            elif media_type == 13:
-                distribution['GIF'] += 1
-            elif media_type == 20:
-                distribution['Sticker'] += 1
-            elif media_type == 9:
-                distribution['Document'] += 1
-            else:
-                distribution['Other'] += 1
+            self._msg_type_dist = distribution
+            return distribution.copy()
+        
+        # NULL is counted as text, unknown codes go to 'Other'
+        media_types = pd.to_numeric(self.messages['media_type'], errors='coerce').fillna(0).astype('int64')
+        
+        for code, count in media_types.value_counts().items():
+            distribution[self.CODE_TO_LABEL.get(code, 'Other')] += int(count)
         
-        return distribution
+        self._msg_type_dist = distribution
+        return distribution.copy()
     
     def get_messages_by_month(self):
         """Message count by month"""
@@ -231,24 +315,24 @@ class WhatsAppAnalyzer:
         else:
             personal_messages = self.messages
         
-        contact_stats = personal_messages.groupby('chat_id').agg({
-            'message_id': 'count',
-            'from_me': lambda x: (x == 1).sum(),
-            'datetime': 'max'
-        }).reset_index()
+        # Native aggregations only (from_me is 0/1, so its sum is the sent count)
+        contact_stats = personal_messages.groupby('chat_id', observed=True, sort=False).agg(
+            total_messages=('message_id', 'count'),
+            sent_by_me=('from_me', 'sum'),
+            last_message=('datetime', 'max')
+        ).reset_index()
         
-        contact_stats.columns = ['chat_id', 'total_messages', 'sent_by_me', 'last_message']
         contact_stats['received'] = contact_stats['total_messages'] - contact_stats['sent_by_me']
+        contact_stats = contact_stats.nlargest(limit, 'total_messages')
         
         # Add contact names
-        contact_stats['contact_name'] = contact_stats['chat_id'].apply(self.get_contact_name)
+        contact_stats['contact_name'] = self._resolve_names_vectorized(contact_stats['chat_id'])
         
         # Balance score hesapla
         contact_stats['balance_score'] = (
             contact_stats['sent_by_me'] / (contact_stats['total_messages'] + 1)
         ).round(2)
         
-        contact_stats = contact_stats.sort_values('total_messages', ascending=False).head(limit)
         return contact_stats
     
     def get_group_statistics(self):
@@ -261,7 +345,7 @@ class WhatsAppAnalyzer:
         if group_messages.empty:
             return pd.DataFrame()
         
-        group_stats = group_messages.groupby('chat_id').agg({
+        group_stats = group_messages.groupby('chat_id', observed=True).agg({
             'message_id': 'count',
             'datetime': ['min', 'max']
         }).reset_index()
@@ -269,9 +353,7 @@ class WhatsAppAnalyzer:
         group_stats.columns = ['group_id', 'total_messages', 'first_message', 'last_message']
         
         # Grup isimlerini ekle
-        group_stats['group_name'] = group_stats['group_id'].apply(
-            lambda x: x.split('@')[0] if '@' in x else x
-        )
+        group_stats['group_name'] = group_stats['group_id'].astype(str).str.split('@', n=1).str[0]
         
         group_stats = group_stats.sort_values('total_messages', ascending=False)
         return group_stats
@@ -297,89 +379,93 @@ class WhatsAppAnalyzer:
         if media_messages.empty:
             return pd.DataFrame()
         
+        # Count per contact and media type in one pass
+        type_counts = media_messages.groupby(['chat_id', 'media_type'], observed=True).size().unstack(fill_value=0)
+        
         # Total media count per contact
-        media_by_contact = media_messages.groupby('chat_id').agg({
-            'message_id': 'count'
-        }).reset_index()
+        totals = type_counts.sum(axis=1).nlargest(limit)
+        type_counts = type_counts.loc[totals.index]
         
-        media_by_contact.columns = ['chat_id', 'total_media']
-        media_by_contact = media_by_contact.sort_values('total_media', ascending=False).head(limit)
+        media_by_contact = pd.DataFrame({
+            'chat_id': totals.index.astype(object),
+            'total_media': totals.to_numpy()
+        })
         
         # Add contact names
-        media_by_contact['contact_name'] = media_by_contact['chat_id'].apply(self.get_contact_name)
+        media_by_contact['contact_name'] = self._resolve_names_vectorized(media_by_contact['chat_id'])
         
         # Detail by media types
-        for media_type in [1, 2, 3]:  # Image, Audio, Video
-            type_counts = media_messages[media_messages['media_type'] == media_type].groupby('chat_id').size()
-            type_name = {1: 'images', 2: 'audio', 3: 'videos'}.get(media_type, f'type_{media_type}')
-            media_by_contact[type_name] = media_by_contact['chat_id'].map(type_counts).fillna(0).astype(int)
+        for media_type, type_name in [(1, 'images'), (2, 'audio'), (3, 'videos')]:
+            if media_type in type_counts.columns:
+                media_by_contact[type_name] = type_counts[media_type].to_numpy().astype(int)
+            else:
+                media_by_contact[type_name] = 0
         
         return media_by_contact
     
     def extract_text_content(self):
-        """Extract text content"""
-        if 'message_text' not in self.messages.columns:
-            return []
+        """Extract text content (decoded once, then cached)"""
+        if self._texts is not None:
+            return self._texts
         
-        texts = self.messages['message_text'].dropna()
-        # Decode byte strings
-        texts = texts.apply(lambda x: x.decode('utf-8', errors='ignore') if isinstance(x, bytes) else str(x))
-        return texts.tolist()
+        if 'message_text' not in self.messages.columns:
+            self._texts = []
+        else:
+            texts = self.messages['message_text'].dropna()
+            # Decode byte strings
+            is_bytes = texts.map(type).eq(bytes)
+            if is_bytes.any():
+                texts = texts.mask(is_bytes, texts[is_bytes].str.decode('utf-8', errors='ignore'))
+            self._texts = texts.astype(str).tolist()
+        
+        self._text_lengths = np.fromiter((len(t) for t in self._texts), dtype=np.int64, count=len(self._texts))
+        return self._texts
     
     def get_word_frequency(self, limit=50):
         """Most frequently used words"""
         texts = self.extract_text_content()
         
-        # Combine all texts
-        all_text = ' '.join(texts)
-        
-        # Split into words (preserve Turkish characters)
-        words = re.findall(r'\b[\wğüşıöçĞÜŞİÖÇ]+\b', all_text.lower())
-        
-        # Filter short words
-        words = [w for w in words if len(w) > 2]
-        
-        # Stop words (common words) - Turkish
-        stop_words = {'bir', 'bu', 'şu', 've', 'veya', 'ama', 'fakat', 'için', 'ile', 'mi', 'mu', 
-                      'mı', 'mü', 'da', 'de', 'ta', 'te', 'ki', 'ne', 'var', 'yok', 'ben', 'sen',
-                      'o', 'biz', 'siz', 'onlar', 'the', 'a', 'an', 'and', 'or', 'but', 'is', 
-                      'are', 'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does', 
-                      'did', 'will', 'would', 'could', 'should'}
-        
-        words = [w for w in words if w not in stop_words]
+        # Count per message instead of joining everything into one big string
+        word_counts = Counter()
+        for text in texts:
+            word_counts.update(
+                w for w in _WORD_RE.findall(text.lower())
+                if len(w) > 2 and w not in _STOP_WORDS  # Filter short words and stop words
+            )
         
         # Frekans hesapla
-        word_freq = Counter(words).most_common(limit)
+        word_freq = word_counts.most_common(limit)
         
         return pd.DataFrame(word_freq, columns=['word', 'frequency'])
     
     def get_emoji_statistics(self, limit=30):
         """Emoji istatistikleri"""
         texts = self.extract_text_content()
-        all_text = ' '.join(texts)
         
-        # Extract emojis
-        emojis = [c for c in all_text if c in emoji_lib.EMOJI_DATA]
+        # Extract emojis (whole sequences: skin tones, ZWJ, flags); ASCII-only texts can't contain any
+        emoji_counts = Counter(
+            e['emoji'] for text in texts if not text.isascii() for e in emoji_lib.emoji_list(text)
+        )
         
-        if not emojis:
+        if not emoji_counts:
             return pd.DataFrame()
         
-        emoji_freq = Counter(emojis).most_common(limit)
+        emoji_freq = emoji_counts.most_common(limit)
         return pd.DataFrame(emoji_freq, columns=['emoji', 'frequency'])
     
     def get_message_length_stats(self):
         """Mesaj uzunluk istatistikleri"""
-        texts = self.extract_text_content()
-        lengths = [len(text) for text in texts]
+        self.extract_text_content()
+        lengths = self._text_lengths
         
-        if not lengths:
+        if lengths.size == 0:
             return {}
         
         stats = {
-            'average_length': np.mean(lengths),
+            'average_length': lengths.mean(),
             'median_length': np.median(lengths),
-            'max_length': max(lengths),
-            'min_length': min(lengths)
+            'max_length': int(lengths.max()),
+            'min_length': int(lengths.min())
         }
         
         return stats
@@ -389,10 +475,18 @@ class WhatsAppAnalyzer:
         if 'day_of_week' not in self.messages.columns or 'hour' not in self.messages.columns:
             return pd.DataFrame()
         
-        heatmap = self.messages.groupby(['day_of_week', 'hour']).size().unstack(fill_value=0)
+        day_of_week = self.messages['day_of_week'].to_numpy(dtype=np.int64, na_value=-1)
+        hour = self.messages['hour'].to_numpy(dtype=np.int64, na_value=-1)
+        valid = (day_of_week >= 0) & (hour >= 0)
+        
+        if not valid.any():
+            return pd.DataFrame()
+        
+        # 7x24 histogram in a single pass
+        counts = np.bincount(day_of_week[valid] * 24 + hour[valid], minlength=7 * 24)
         
         day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap.index = [day_names[int(i)] if int(i) < len(day_names) else str(i) for i in heatmap.index]
+        heatmap = pd.DataFrame(counts.reshape(7, 24), index=day_names, columns=pd.Index(range(24), name='hour'))
         
         return heatmap
     
@@ -409,93 +503,113 @@ class WhatsAppAnalyzer:
         if 'chat_id' not in self.messages.columns:
             return pd.DataFrame()
         
-        conv = self.messages[self.messages['chat_id'] == chat_id].copy()
+        positions = self._chat_slices.get(chat_id)
         
-        if conv.empty:
+        if positions is None or limit <= 0:
             return pd.DataFrame()
         
-        # Get only necessary columns and sort
-        conv = conv.sort_values('timestamp', ascending=True)
-        
-        # Limit uygula
-        if len(conv) > limit:
-            # Get last N messages
-            conv = conv.tail(limit)
-        
-        return conv
+        # Positions are already in time order, get last N messages
+        return self.messages.iloc[positions[-limit:]]
     
     def get_longest_messages(self, limit=10):
         """Get longest messages"""
         texts = self.extract_text_content()
+        lengths = self._text_lengths
         
-        if not texts:
+        # Skip very short ones
+        candidates = np.flatnonzero(lengths > 10)
+        if candidates.size == 0 or limit <= 0:
             return pd.DataFrame()
         
-        # Store messages with their lengths
-        msg_lengths = []
-        for idx, text in enumerate(texts):
-            if pd.notna(text) and len(str(text)) > 10:  # Skip very short ones
-                msg_lengths.append({
-                    'index': idx,
-                    'length': len(str(text)),
-                    'text': str(text)[:500]  # First 500 characters
-                })
-        
-        if not msg_lengths:
-            return pd.DataFrame()
+        # Top N without sorting every message
+        k = min(limit, candidates.size)
+        top = candidates[np.argpartition(-lengths[candidates], k - 1)[:k]]
+        top = top[np.argsort(-lengths[top], kind='stable')]
         
-        df = pd.DataFrame(msg_lengths)
-        df = df.sort_values('length', ascending=False).head(limit)
-        
-        return df
+        return pd.DataFrame({
+            'index': top,
+            'length': lengths[top],
+            'text': [texts[i][:500] for i in top]  # First 500 characters
+        })
     
     def get_random_message_samples(self, count=20):
         """Random message samples"""
         if 'message_text' not in self.messages.columns:
             return pd.DataFrame()
         
-        text_messages = self.messages[self.messages['message_text'].notna()].copy()
+        # Sample row positions instead of copying all text messages
+        text_positions = np.flatnonzero(self.messages['message_text'].notna().to_numpy())
         
-        if text_messages.empty:
+        if text_positions.size == 0:
             return pd.DataFrame()
         
-        sample_size = min(count, len(text_messages))
-        samples = text_messages.sample(n=sample_size)
+        sample_size = min(count, text_positions.size)
+        picked = np.random.choice(text_positions, size=sample_size, replace=False)
         
-        return samples[['chat_id', 'from_me', 'datetime', 'message_text']]
+        return self.messages.iloc[picked][['chat_id', 'from_me', 'datetime', 'message_text']]
     
-    def get_conversation_details_for_contact(self, chat_id):
-        """Detailed conversation info for a contact"""
-        if 'chat_id' not in self.messages.columns:
-            return {}
+    def get_conversations_for_contacts(self, chat_ids, per_chat_limit=100):
+        """Last N messages of several conversations in one gather (rows grouped by chat, in time order)"""
+        if 'chat_id' not in self.messages.columns or per_chat_limit <= 0:
+            return pd.DataFrame()
         
-        conv = self.messages[self.messages['chat_id'] == chat_id].copy()
+        positions = [self._chat_slices[c][-per_chat_limit:] for c in chat_ids if c in self._chat_slices]
+        if not positions:
+            return pd.DataFrame()
         
-        if conv.empty:
+        return self.messages.iloc[np.concatenate(positions)]
+    
+    def get_conversation_details_for_contacts(self, chat_ids):
+        """Detailed conversation info for several contacts (chat_id -> details dict)"""
+        if 'chat_id' not in self.messages.columns:
             return {}
         
-        details = {
-            'chat_id': chat_id,
-            'contact_name': self.get_contact_name(chat_id),
-            'total_messages': len(conv),
-            'sent_by_me': int((conv['from_me'] == 1).sum()),
-            'received': int((conv['from_me'] == 0).sum()),
-            'first_message': conv['datetime'].min() if 'datetime' in conv.columns else None,
-            'last_message': conv['datetime'].max() if 'datetime' in conv.columns else None,
-            'avg_message_length': conv['message_text'].str.len().mean() if 'message_text' in conv.columns else 0,
-        }
+        chat_ids = [c for c in dict.fromkeys(chat_ids) if c in self._chat_slices]
+        if not chat_ids:
+            return {}
         
-        # Media counts
-        if 'media_type' in conv.columns:
-            details['media_count'] = int((conv['media_type'] > 0).sum())
-        else:
-            details['media_count'] = 0
+        # One gather for all requested chats, then a slice per chat (positions are already grouped)
+        columns = [c for c in ['from_me', 'datetime', 'message_text', 'media_type', 'hour'] if c in self.messages.columns]
+        chat_positions = [self._chat_slices[c] for c in chat_ids]
+        all_convs = self.messages.iloc[np.concatenate(chat_positions)][columns]
+        bounds = np.cumsum([0] + [p.size for p in chat_positions])
         
-        # En aktif saatler
-        if 'hour' in conv.columns:
-            details['most_active_hour'] = int(conv.groupby('hour').size().idxmax())
+        details_by_chat = {}
+        for chat_id, lo, hi in zip(chat_ids, bounds[:-1], bounds[1:]):
+            conv = all_convs.iloc[lo:hi]
+            from_me = conv['from_me'].to_numpy()
+            
+            details = {
+                'chat_id': chat_id,
+                'contact_name': self.get_contact_name(chat_id),
+                'total_messages': len(conv),
+                'sent_by_me': int(np.count_nonzero(from_me == 1)),
+                'received': int(np.count_nonzero(from_me == 0)),
+                'first_message': conv['datetime'].min() if 'datetime' in conv.columns else None,
+                'last_message': conv['datetime'].max() if 'datetime' in conv.columns else None,
+                'avg_message_length': conv['message_text'].str.len().mean() if 'message_text' in conv.columns else 0,
+            }
+            
+            # Media counts
+            if 'media_type' in conv.columns:
+                details['media_count'] = int((conv['media_type'] > 0).sum())
+            else:
+                details['media_count'] = 0
+            
+            # En aktif saatler (24-bucket histogram)
+            if 'hour' in conv.columns:
+                hours = conv['hour'].to_numpy(dtype=np.int64, na_value=-1)
+                hours = hours[hours >= 0]
+                if hours.size:
+                    details['most_active_hour'] = int(np.bincount(hours).argmax())
+            
+            details_by_chat[chat_id] = details
         
-        return details
+        return details_by_chat
+    
+    def get_conversation_details_for_contact(self, chat_id):
+        """Detailed conversation info for a contact"""
+        return self.get_conversation_details_for_contacts([chat_id]).get(chat_id, {})
     
     def get_recent_messages(self, limit=50):
         """Get last message from each user"""
@@ -503,21 +617,14 @@ class WhatsAppAnalyzer:
             return pd.DataFrame()
         
         # Get last message for each chat_id
-        recent_per_contact = []
-        for chat_id in self.messages['chat_id'].unique():
-            if pd.isna(chat_id):
-                continue
-            chat_messages = self.messages[self.messages['chat_id'] == chat_id]
-            if not chat_messages.empty:
-                last_msg = chat_messages.sort_values('datetime', ascending=False).iloc[0]
-                recent_per_contact.append(last_msg)
-        
-        if not recent_per_contact:
+        valid = self.messages.dropna(subset=['chat_id', 'datetime'])
+        if valid.empty:
             return pd.DataFrame()
         
-        # Create DataFrame and sort by date
-        recent_df = pd.DataFrame(recent_per_contact)
-        recent_df = recent_df.sort_values('datetime', ascending=False).head(limit)
+        last_idx = valid.groupby('chat_id', observed=True, sort=False)['datetime'].idxmax()
+        
+        # Sort by date
+        recent_df = self.messages.loc[last_idx].sort_values('datetime', ascending=False).head(limit)
         
         return recent_df[['chat_id', 'from_me', 'datetime', 'message_text', 'media_type']]
     
@@ -527,21 +634,14 @@ class WhatsAppAnalyzer:
             return pd.DataFrame()
         
         # Get first message for each chat_id
-        first_per_contact = []
-        for chat_id in self.messages['chat_id'].unique():
-            if pd.isna(chat_id):
-                continue
-            chat_messages = self.messages[self.messages['chat_id'] == chat_id]
-            if not chat_messages.empty:
-                first_msg = chat_messages.sort_values('datetime', ascending=True).iloc[0]
-                first_per_contact.append(first_msg)
-        
-        if not first_per_contact:
+        valid = self.messages.dropna(subset=['chat_id', 'datetime'])
+        if valid.empty:
             return pd.DataFrame()
         
-        # Create DataFrame and sort by date
-        first_df = pd.DataFrame(first_per_contact)
-        first_df = first_df.sort_values('datetime', ascending=True).head(limit)
+        first_idx = valid.groupby('chat_id', observed=True, sort=False)['datetime'].idxmin()
+        
+        # Sort by date
+        first_df = self.messages.loc[first_idx].sort_values('datetime', ascending=True).head(limit)
         
         return first_df[['chat_id', 'from_me', 'datetime', 'message_text', 'media_type']]
     
@@ -550,44 +650,58 @@ class WhatsAppAnalyzer:
         if 'message_text' not in self.messages.columns:
             return pd.DataFrame()
         
-        # Convert message texts to string
-        self.messages['message_text_str'] = self.messages['message_text'].apply(
-            lambda x: str(x).lower() if pd.notna(x) else ''
-        )
+        texts = self.messages['message_text']
+        # Decode byte strings
+        if texts.dtype == object:
+            is_bytes = texts.map(type).eq(bytes)
+            if is_bytes.any():
+                texts = texts.mask(is_bytes, texts[is_bytes].str.decode('utf-8', errors='ignore'))
         
-        # Arama yap
-        matches = self.messages[
-            self.messages['message_text_str'].str.contains(keyword.lower(), na=False)
-        ].copy()
+        # Arama yap (plain substring, case-insensitive)
+        hits = texts.astype('string').str.contains(keyword, case=False, na=False, regex=False)
         
-        if matches.empty:
+        if not hits.any():
             return pd.DataFrame()
         
-        return matches[['chat_id', 'from_me', 'datetime', 'message_text']].head(limit)
+        return self.messages.loc[hits, ['chat_id', 'from_me', 'datetime', 'message_text']].head(limit)
+    
+    def get_report_bundle(self):
+        """All analyses the HTML report needs, in one call (dict of results)"""
+        # Time-series data (monthly / hourly / daily / heatmap) has no chart in the report, so it is not computed here
+        return {
+            'general': self.get_general_statistics(),
+            'msg_distribution': self.get_message_type_distribution(),
+            'top_contacts': self.get_top_contacts(20),
+            'group_stats': self.get_group_statistics(),
+            'media_stats': self.get_media_statistics(),
+            'top_media_senders': self.get_top_media_senders(10),
+            'word_freq': self.get_word_frequency(50),
+            'emoji_stats': self.get_emoji_statistics(30),
+            'msg_length': self.get_message_length_stats(),
+            'deleted_count': self.get_deleted_messages_count(),
+            'longest_messages': self.get_longest_messages(10),
+            'recent_messages': self.get_recent_messages(30),
+            'first_messages': self.get_first_messages(20),
+            'response_time': self.get_message_response_time_analysis(),
+        }
     
     def get_message_response_time_analysis(self):
         """Analyze message response times"""
         if 'datetime' not in self.messages.columns or 'from_me' not in self.messages.columns:
             return {}
         
-        # Group by conversations
-        response_times = []
+        # Pair every message with the previous one in the same conversation (rows are already in time order)
+        df = self.messages[['chat_id', 'datetime', 'from_me']].dropna()
+        by_chat = df.groupby('chat_id', observed=True, sort=False)
+        prev_from_me = by_chat['from_me'].shift(1)
+        prev_datetime = by_chat['datetime'].shift(1)
         
-        for chat_id in self.messages['chat_id'].unique():
-            chat_msgs = self.messages[self.messages['chat_id'] == chat_id].sort_values('datetime')
-            
-            # Check if from_me changes between consecutive messages
-            for i in range(1, len(chat_msgs)):
-                prev = chat_msgs.iloc[i-1]
-                curr = chat_msgs.iloc[i]
-                
-                # If the other party messaged and I replied
-                if prev['from_me'] == 0 and curr['from_me'] == 1:
-                    time_diff = (curr['datetime'] - prev['datetime']).total_seconds() / 60  # dakika
-                    if 0 < time_diff < 1440:  # Within 24 hours
-                        response_times.append(time_diff)
-        
-        if not response_times:
+        # If the other party messaged and I replied
+        replied = (prev_from_me == 0) & (df['from_me'] == 1)
+        time_diff = (df['datetime'] - prev_datetime).dt.total_seconds() / 60  # dakika
+        response_times = time_diff[replied & (time_diff > 0) & (time_diff < 1440)].to_numpy()  # Within 24 hours
+        
+        if response_times.size == 0:
             return {}
         
         return {
@@ -5,13 +5,30 @@ This creates fake but realistic-looking WhatsApp data for testing purposes
 """
 
 import sqlite3
-import random
+import numpy as np
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+def _apply_bulk_write_pragmas(conn):
+    """Fast write settings for this single-writer bootstrap script"""
+    conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+
+
+def _finalize_demo_db(conn):
+    """Switch back to a rollback journal so the demo file has no -wal/-shm sidecars"""
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
 
 def create_demo_msgstore():
     """Create a realistic demo msgstore.db"""
     
     conn = sqlite3.connect('demo_msgstore.db')
+    _apply_bulk_write_pragmas(conn)
     cursor = conn.cursor()
     
     # Create tables with modern WhatsApp schema
@@ -133,83 +150,117 @@ def create_demo_msgstore():
         'media_caption': ["Check this out!", "Look at this!", "😍", "Wow!", "Amazing!"],
     }
     
+    # Rows are collected first and written with executemany in one transaction
+    jid_rows = []
+    
     # Create JIDs for contacts
     jid_map = {}
     for idx, (name, number) in enumerate(contacts):
         jid_string = f"{number}@s.whatsapp.net"
-        cursor.execute('''
-            INSERT OR IGNORE INTO jid (_id, user, server, agent, device, type, raw_string)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (idx + 1, number, "s.whatsapp.net", 0, 0, 0, jid_string))
+        jid_rows.append((idx + 1, number, "s.whatsapp.net", 0, 0, 0, jid_string))
         jid_map[idx + 1] = (name, number, jid_string)
     
-    # Create chats
-    for jid_id in range(1, len(contacts) + 1):
-        cursor.execute('''
-            INSERT INTO chat (_id, jid_row_id, hidden, archived, sort_timestamp)
-            VALUES (?, ?, 0, 0, ?)
-        ''', (jid_id, jid_id, int(datetime.now().timestamp() * 1000)))
+    # Create chats (the clock is read once and shared by every row)
+    now = datetime.now()
+    now_ms = int(now.timestamp() * 1000)
+    chat_rows = [(jid_id, jid_id, now_ms) for jid_id in range(1, len(contacts) + 1)]
     
-    # Create realistic messages
-    message_id = 1
-    base_time = datetime.now() - timedelta(days=90)  # Start 90 days ago
+    # Create realistic messages (one NumPy draw per column instead of per message)
+    rng = np.random.default_rng()
+    # msg_type -> mime type lookup table (index = message_type code)
+    mime_lut = np.full(21, 'application/octet-stream', dtype=object)
+    mime_lut[1] = 'image/jpeg'
+    mime_lut[2] = 'audio/ogg; codecs=opus'
+    mime_lut[3] = 'video/mp4'
+    mime_lut[20] = 'image/webp'
+    base_time = now - timedelta(days=90)  # Start 90 days ago
+    base_ms = int(base_time.timestamp() * 1000)
     
-    for chat_id in range(1, len(contacts) + 1):
-        # Each contact gets 15-50 messages
-        num_messages = random.randint(15, 50)
-        conversation_time = base_time + timedelta(days=random.randint(0, 80))
-        
-        for msg_idx in range(num_messages):
-            # Simulate conversation flow
-            from_me = random.choice([0, 1])
-            
-            # Choose message type (0=text, 1=image, 2=audio, 3=video, etc.)
-            msg_type = random.choices(
-                [0, 1, 2, 3, 20],  # text, image, audio, video, sticker
-                weights=[70, 15, 5, 5, 5]
-            )[0]
-            
-            # Generate message text
-            if msg_type == 0:  # Text message
-                category = random.choice(list(message_templates.keys()))
-                text = random.choice(message_templates[category])
-            else:
-                text = random.choice(message_templates['media_caption']) if random.random() > 0.5 else None
-            
-            timestamp = int((conversation_time + timedelta(hours=msg_idx * random.uniform(0.5, 8))).timestamp() * 1000)
-            
-            cursor.execute('''
-                INSERT INTO message (_id, chat_row_id, from_me, key_id, sender_jid_row_id, 
-                                   status, message_type, text_data, sort_id, timestamp, originator_device_timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (message_id, chat_id, from_me, f"KEY{message_id}", chat_id if from_me == 0 else None,
-                  5, msg_type, text, message_id, timestamp, timestamp))
-            
-            # Add media info if not a text message
-            if msg_type != 0:
-                mime_types = {
-                    1: 'image/jpeg',
-                    2: 'audio/ogg; codecs=opus',
-                    3: 'video/mp4',
-                    20: 'image/webp'
-                }
-                cursor.execute('''
-                    INSERT INTO message_media (message_row_id, chat_row_id, mime_type, file_size)
-                    VALUES (?, ?, ?, ?)
-                ''', (message_id, chat_id, mime_types.get(msg_type, 'application/octet-stream'), 
-                      random.randint(50000, 5000000)))
-            
-            message_id += 1
+    # Each contact gets 15-50 messages
+    num_chats = len(contacts)
+    num_messages = rng.integers(15, 51, size=num_chats)
+    total = int(num_messages.sum())
+    chat_ids = np.repeat(np.arange(1, num_chats + 1), num_messages)
+    chat_starts = np.concatenate(([0], np.cumsum(num_messages)[:-1]))
     
-    conn.commit()
-    conn.close()
-    print(f"✅ Created demo_msgstore.db with {message_id-1} messages")
+    # Simulate conversation flow
+    from_me = rng.integers(0, 2, size=total)
+    
+    # Choose message type (0=text, 1=image, 2=audio, 3=video, 20=sticker)
+    msg_types = rng.choice([0, 1, 2, 3, 20], size=total, p=[0.70, 0.15, 0.05, 0.05, 0.05])
+    
+    # Timestamps: each chat starts on a random day, message i at i * uniform(0.5, 8) hours
+    conversation_ms = base_ms + rng.integers(0, 81, size=num_chats) * 86_400_000
+    msg_idx = np.arange(total) - np.repeat(chat_starts, num_messages)
+    hours = msg_idx * rng.uniform(0.5, 8, size=total)
+    timestamps = np.repeat(conversation_ms, num_messages) + (hours * 3_600_000).astype(np.int64)
+    
+    # Generate message text: random category, then a random template in it (index into the
+    # flattened templates), a caption (or None) for media messages
+    all_texts = np.array([text for templates in message_templates.values() for text in templates], dtype=object)
+    category_sizes = np.array([len(templates) for templates in message_templates.values()])
+    category_starts = np.concatenate(([0], np.cumsum(category_sizes)[:-1]))
+    media_caps = np.array(message_templates['media_caption'], dtype=object)
+    
+    is_text = msg_types == 0
+    num_media = total - int(is_text.sum())
+    categories = rng.integers(0, len(category_sizes), size=total - num_media)
+    picks = (rng.random(total - num_media) * category_sizes[categories]).astype(np.int64)
+    texts = np.empty(total, dtype=object)
+    texts[is_text] = all_texts[category_starts[categories] + picks]
+    texts[~is_text] = np.where(rng.random(num_media) > 0.5,
+                               media_caps[rng.integers(0, len(media_caps), size=num_media)], None)
+    
+    message_ids = np.arange(1, total + 1)
+    msg_rows = [
+        (message_id, chat_id, me, f"KEY{message_id}", chat_id if me == 0 else None,
+         5, msg_type, text, message_id, timestamp, timestamp)
+        for message_id, chat_id, me, msg_type, text, timestamp in zip(
+            message_ids.tolist(), chat_ids.tolist(), from_me.tolist(),
+            msg_types.tolist(), texts.tolist(), timestamps.tolist()
+        )
+    ]
+    
+    # Add media info for non-text messages
+    is_media = ~is_text
+    file_sizes = rng.integers(50000, 5000001, size=num_media)
+    media_rows = list(zip(
+        message_ids[is_media].tolist(), chat_ids[is_media].tolist(),
+        mime_lut[msg_types[is_media]].tolist(), file_sizes.tolist()
+    ))
+    
+    with conn:
+        cursor.executemany('''
+            INSERT OR IGNORE INTO jid (_id, user, server, agent, device, type, raw_string)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', jid_rows)
+        cursor.executemany('''
+            INSERT INTO chat (_id, jid_row_id, hidden, archived, sort_timestamp)
+            VALUES (?, ?, 0, 0, ?)
+        ''', chat_rows)
+        cursor.executemany('''
+            INSERT INTO message (_id, chat_row_id, from_me, key_id, sender_jid_row_id, 
+                               status, message_type, text_data, sort_id, timestamp, originator_device_timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', msg_rows)
+        cursor.executemany('''
+            INSERT INTO message_media (message_row_id, chat_row_id, mime_type, file_size)
+            VALUES (?, ?, ?, ?)
+        ''', media_rows)
+        
+        # Indexes on the join columns used by WhatsAppDatabaseReader (built after the bulk load)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_msg_chat ON message(chat_row_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_msg_sender ON message(sender_jid_row_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_jid ON chat(jid_row_id)")
+    _finalize_demo_db(conn)
+    print(f"✅ Created demo_msgstore.db with {total} messages")
 
 
 def create_demo_wa():
     """Create a realistic demo wa.db"""
     
     conn = sqlite3.connect('demo_wa.db')
+    _apply_bulk_write_pragmas(conn)
     cursor = conn.cursor()
     
     # Create jid table first (for mapping)
@@ -274,38 +325,40 @@ def create_demo_wa():
         ("Henry Ford", "Henry", "Ford", "8901234567@s.whatsapp.net", "8901234567", "Available"),
     ]
     
-    # First insert into jid table
-    for idx, (_, _, _, jid, number, _) in enumerate(contacts):
-        cursor.execute('''
+    with conn:
+        # First insert into jid table
+        cursor.executemany('''
             INSERT INTO jid (_id, user, server, type, raw_string)
             VALUES (?, ?, ?, ?, ?)
-        ''', (idx + 1, number, "s.whatsapp.net", 0, jid))
-    
-    # Insert contacts
-    for idx, (display_name, given_name, family_name, jid, number, status) in enumerate(contacts):
-        cursor.execute('''
+        ''', [(idx + 1, number, "s.whatsapp.net", 0, jid)
+              for idx, (_, _, _, jid, number, _) in enumerate(contacts)])
+        
+        # Insert contacts
+        cursor.executemany('''
             INSERT INTO wa_contacts (_id, jid, is_whatsapp_user, status, number, display_name, 
                                    given_name, family_name, wa_name, sort_name)
             VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
-        ''', (idx + 1, jid, status, number, display_name, given_name, family_name, given_name, display_name))
-    
-    # Populate jid_map (mapping LID to normal JID - in this demo they're the same)
-    for idx in range(1, len(contacts) + 1):
-        cursor.execute('''
+        ''', [(idx + 1, jid, status, number, display_name, given_name, family_name, given_name, display_name)
+              for idx, (display_name, given_name, family_name, jid, number, status) in enumerate(contacts)])
+        
+        # Populate jid_map (mapping LID to normal JID - in this demo they're the same)
+        cursor.executemany('''
             INSERT INTO jid_map (_id, lid_row_id, jid_row_id)
             VALUES (?, ?, ?)
-        ''', (idx, idx, idx))
+        ''', [(idx, idx, idx) for idx in range(1, len(contacts) + 1)])
     
-    conn.commit()
-    conn.close()
+    _finalize_demo_db(conn)
     print(f"✅ Created demo_wa.db with {len(contacts)} contacts")
 
 
 if __name__ == '__main__':
     print("🔨 Creating demo WhatsApp databases...")
     print("=" * 60)
-    create_demo_msgstore()
-    create_demo_wa()
+    # The two files are independent, so they are written in parallel (sqlite3 releases the GIL)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(create_demo_msgstore), executor.submit(create_demo_wa)]
+        for future in futures:
+            future.result()
     print("=" * 60)
     print("✅ Demo databases created successfully!")
     print("\n📝 You can now test with:")
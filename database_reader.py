@@ -4,14 +4,37 @@ Reads and processes msgstore.db and wa.db files
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 class WhatsAppDatabaseReader:
     """Class for reading and processing WhatsApp databases"""
     
+    # WhatsApp message_type codes -> media type
+    MESSAGE_TYPE_TO_MEDIA = {
+        0: 0,   # Text
+        1: 1,   # Image
+        2: 2,   # Audio/Voice
+        3: 3,   # Video
+        4: 4,   # Contact
+        5: 5,   # Location
+        7: 9,   # Document
+        8: 2,   # Audio
+        9: 9,   # Document
+        13: 13, # GIF
+        14: 2,  # Voice note
+        15: 1,  # Image
+        20: 20, # Sticker
+        26: 3,  # Video note
+        42: 9,  # Product
+        43: 9,  # Order
+    }
+    
     def __init__(self, msgstore_path, wa_db_path=None):
         """
         Args:
@@ -22,19 +45,27 @@ class WhatsAppDatabaseReader:
         self.wa_db_path = wa_db_path
         self.msgstore_conn = None
         self.wa_conn = None
-        self.lid_map_df = None
+        self._lid_map_df = None
+        self._has_sender_jid = None
+        self._has_jid_map = None
+        self._messages_with_media = None
+        self._log = print  # status lines; read_all workers collect them instead of printing
         
     def connect(self):
         """Connect to databases"""
         try:
             if os.path.exists(self.msgstore_path):
-                self.msgstore_conn = sqlite3.connect(self.msgstore_path)
+                self.msgstore_conn = self._open_read_only(self.msgstore_path)
+                self._apply_read_pragmas(self.msgstore_conn, self.msgstore_path)
+                self._has_sender_jid = self._detect_sender_jid()
+                self._has_jid_map = self._has_table('jid_map')
                 print(f"✅ msgstore.db connection successful")
             else:
                 raise FileNotFoundError(f"msgstore.db not found: {self.msgstore_path}")
                 
             if self.wa_db_path and os.path.exists(self.wa_db_path):
-                self.wa_conn = sqlite3.connect(self.wa_db_path)
+                self.wa_conn = self._open_read_only(self.wa_db_path)
+                self._apply_read_pragmas(self.wa_conn, self.wa_db_path)
                 print(f"✅ wa.db connection successful")
             else:
                 print(f"⚠️ wa.db not found, group analysis will be limited")
@@ -43,25 +74,95 @@ class WhatsAppDatabaseReader:
             print(f"❌ Database connection error: {e}")
             raise
     
+    def _open_read_only(self, db_path):
+        """Open a database read-only; backups without a -wal file are opened immutable (no locking)"""
+        uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        if not os.path.exists(f"{db_path}-wal"):
+            uri += '&immutable=1'
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+    
+    # Upper bound for the memory mapped part of a database file
+    MAX_MMAP_SIZE = 1024 * 1024 * 1024  # 1 GB
+    
+    def _apply_read_pragmas(self, conn, db_path):
+        """Read-only analytics settings: bigger page cache, memory temp store, mmap reads"""
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA cache_size=-262144")  # 256 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        # Map only as much as the file needs (small demo DBs get a small mapping)
+        mmap_size = min(os.path.getsize(db_path), self.MAX_MMAP_SIZE)
+        conn.execute(f"PRAGMA mmap_size={mmap_size}")
+    
     def close(self):
         """Close database connections"""
         if self.msgstore_conn:
             self.msgstore_conn.close()
+            self.msgstore_conn = None
         if self.wa_conn:
             self.wa_conn.close()
+            self.wa_conn = None
+    
+    def __enter__(self):
+        """with WhatsAppDatabaseReader(...) as reader: one connection (and warm page cache) for all get_* calls"""
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def _detect_sender_jid(self):
+        """Check once whether the message table has sender_jid_row_id"""
+        cursor = self.msgstore_conn.execute("PRAGMA table_info(message)")
+        return any(col[1] == 'sender_jid_row_id' for col in cursor)
+    
+    def _has_table(self, table_name):
+        """Check whether msgstore has the given table"""
+        cursor = self.msgstore_conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        )
+        return cursor.fetchone() is not None
     
-    def get_messages(self):
-        """Fetch all messages"""
+    def get_messages_with_media(self):
+        """Fetch all messages together with their message_media columns (single scan)
+        
+        The next get_media_info() call is served from this frame instead of scanning
+        the message table again (the reader releases it after that call).
+        """
+        return self.get_messages(with_media=True)
+    
+    def get_messages(self, chunksize=None, with_media=False):
+        """Fetch all messages
+        
+        Args:
+            chunksize: verilirse tek DataFrame yerine chunk'lar halinde iterator doner
+            with_media: message_media kolonlarini da ekle (media_size, media_name, media_mime_type)
+        """
         try:
-            # First check if sender_jid_row_id column exists
-            cursor = self.msgstore_conn.cursor()
-            cursor.execute("PRAGMA table_info(message)")
-            columns = [col[1] for col in cursor.fetchall()]
-            has_sender_jid = 'sender_jid_row_id' in columns
+            # Schema is detected once in connect()
+            if self._has_sender_jid is None:
+                self._has_sender_jid = self._detect_sender_jid()
+            
+            # Media type mapping is done in SQL instead of a per-row apply
+            media_case = self._media_type_case_sql()
+            
+            # Media file columns in the same scan (get_messages_with_media)
+            with_media = with_media and self._has_table('message_media')
+            if with_media:
+                media_cols = """,
+                    mm.file_size as media_size,
+                    mm.media_name,
+                    mm.mime_type as media_mime_type"""
+                media_join = """
+                LEFT JOIN message_media AS mm ON m._id = mm.message_row_id"""
+            else:
+                media_cols = ""
+                media_join = ""
             
             # Modern WhatsApp database structure (normalized)
-            if has_sender_jid:
-                query = """
+            if self._has_sender_jid:
+                query = f"""
                 SELECT 
                     m._id as message_id,
                     m.chat_row_id,
@@ -69,19 +170,20 @@ class WhatsAppDatabaseReader:
                     m.timestamp,
                     m.text_data as message_text,
                     m.message_type,
+                    {media_case} as media_type,
                     m.status,
                     j.raw_string as chat_jid,
-                    sender_j.raw_string as sender_jid
+                    sender_j.raw_string as sender_jid{media_cols}
                 FROM message AS m
                 LEFT JOIN chat AS c ON m.chat_row_id = c._id
                 LEFT JOIN jid AS j ON c.jid_row_id = j._id
-                LEFT JOIN jid AS sender_j ON m.sender_jid_row_id = sender_j._id
+                LEFT JOIN jid AS sender_j ON m.sender_jid_row_id = sender_j._id{media_join}
                 WHERE m.chat_row_id > 0
                 ORDER BY m.timestamp ASC
                 """
             else:
                 # Basit versiyon (sender_jid_row_id yok)
-                query = """
+                query = f"""
                 SELECT 
                     m._id as message_id,
                     m.chat_row_id,
@@ -89,68 +191,160 @@ class WhatsAppDatabaseReader:
                     m.timestamp,
                     m.text_data as message_text,
                     m.message_type,
+                    {media_case} as media_type,
                     m.status,
-                    j.raw_string as chat_jid
+                    j.raw_string as chat_jid{media_cols}
                 FROM message AS m
                 LEFT JOIN chat AS c ON m.chat_row_id = c._id
-                LEFT JOIN jid AS j ON c.jid_row_id = j._id
+                LEFT JOIN jid AS j ON c.jid_row_id = j._id{media_join}
                 WHERE m.chat_row_id > 0
                 ORDER BY m.timestamp ASC
                 """
             
-            df = pd.read_sql_query(query, self.msgstore_conn)
-            
-            # Convert timestamp to datetime (in milliseconds)
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', errors='coerce')
+            if chunksize:
+                return self._iter_message_chunks(query, chunksize)
             
-            # Determine chat type (group or personal)
-            df['is_group'] = df['chat_jid'].str.contains('@g.us', na=False)
-            df['chat_id'] = df['chat_jid']  # For compatibility
-            
-            # Extract media info from message_type
-            df['media_type'] = df['message_type'].apply(self._map_message_type_to_media)
+            # Read in chunks and compact each one, so the wide int64/object result
+            # never exists for the whole table at once
+            df = self._concat_message_chunks(
+                pd.read_sql_query(query, self.msgstore_conn, chunksize=self.MESSAGE_CHUNKSIZE)
+            )
+            if with_media:
+                self._messages_with_media = df
             
             # from_me bilgisini kontrol et ve logla
             if 'from_me' in df.columns:
-                sent_count = (df['from_me'] == 1).sum()
-                received_count = (df['from_me'] == 0).sum()
-                print(f"✅ {len(df)} messages loaded (Sent: {sent_count}, Received: {received_count})")
+                from_me_counts = df['from_me'].value_counts()
+                sent_count = int(from_me_counts.get(1, 0))
+                received_count = int(from_me_counts.get(0, 0))
+                self._log(f"✅ {len(df)} messages loaded (Sent: {sent_count}, Received: {received_count})")
             else:
-                print(f"✅ {len(df)} messages loaded")
+                self._log(f"✅ {len(df)} messages loaded")
             
             return df
             
         except Exception as e:
-            print(f"❌ Message reading error: {e}")
-            print(f"   Error details: {str(e)}")
+            self._log(f"❌ Message reading error: {e}")
+            self._log(f"   Error details: {str(e)}")
             return pd.DataFrame()
     
+    # Rows per read_sql_query chunk when building the full message frame
+    MESSAGE_CHUNKSIZE = 200_000
+    
+    # Compact dtypes for the message columns (nullable variant if the column has NULLs)
+    MESSAGE_DTYPES = {
+        'message_id': 'int64',
+        'chat_row_id': 'int32',
+        'from_me': 'int8',
+        'message_type': 'int16',
+        'media_type': 'int8',
+        'status': 'int16',
+    }
+    
+    @staticmethod
+    def _ms_to_datetime(timestamps):
+        """Millisecond epoch -> datetime64[ms] by reinterpreting the int64 buffer (no per-value parsing)"""
+        if timestamps.dtype.kind in 'iu':
+            values = timestamps.to_numpy(dtype=np.int64)
+        elif timestamps.dtype.kind == 'f':
+            # NULL timestamps (float NaN) and out-of-range values become NaT
+            raw = timestamps.to_numpy()
+            valid = np.isfinite(raw) & (np.abs(raw) < 9.2e18)
+            values = np.where(valid, raw, 0).astype(np.int64)
+            values[~valid] = np.iinfo(np.int64).min  # NaT
+        else:
+            return pd.to_datetime(timestamps, unit='ms', errors='coerce')
+        return pd.Series(values.view('datetime64[ms]'), index=timestamps.index)
+    
+    def _downcast_messages(self, df):
+        """Shrink the default int64/object columns returned by read_sql_query"""
+        casts = {}
+        for col, dtype in self.MESSAGE_DTYPES.items():
+            if col in df.columns:
+                casts[col] = dtype if df[col].notna().all() else dtype.capitalize()
+        df = df.astype(casts)
+        
+        for col in ('chat_jid', 'sender_jid'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
+    
+    def _prepare_messages(self, df):
+        """Add derived columns to a message frame (or chunk)"""
+        df = self._downcast_messages(df)
+        
+        # Convert timestamp to datetime (in milliseconds)
+        df['datetime'] = self._ms_to_datetime(df['timestamp'])
+        
+        # Determine chat type (group or personal): check each distinct JID once, then gather by code
+        chat_jids = df['chat_jid'].cat
+        is_group_jid = np.append(chat_jids.categories.str.endswith('@g.us'), False)  # code -1 = NULL
+        df['is_group'] = is_group_jid[chat_jids.codes.to_numpy()]
+        df['chat_id'] = df['chat_jid']  # For compatibility
+        return df
+    
+    def iter_messages(self, chunksize=200_000):
+        """Iterate over prepared message chunks (same columns as get_messages)"""
+        return self.get_messages(chunksize=chunksize)
+    
+    def _concat_message_chunks(self, raw_chunks):
+        """Prepare (downcast) each raw chunk and join them into one compact frame"""
+        chunks = [self._prepare_messages(chunk) for chunk in raw_chunks]
+        if len(chunks) == 1:
+            return chunks[0]
+        
+        df = pd.concat(chunks, ignore_index=True)
+        # Chunks have their own categories; concat falls back to object, so re-categorize
+        for col in ('chat_jid', 'sender_jid', 'chat_id'):
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        return df
+    
+    def _iter_message_chunks(self, query, chunksize):
+        """Yield prepared message chunks without materializing the full result"""
+        total = 0
+        for chunk in pd.read_sql_query(query, self.msgstore_conn, chunksize=chunksize):
+            total += len(chunk)
+            yield self._prepare_messages(chunk)
+        self._log(f"✅ {total} messages loaded (in chunks of {chunksize})")
+    
     def _map_message_type_to_media(self, msg_type):
         """Convert message type to media type"""
         if pd.isna(msg_type):
             return 0  # Text
         
-        # WhatsApp message_type codes
-        type_map = {
-            0: 0,   # Text
-            1: 1,   # Image
-            2: 2,   # Audio/Voice
-            3: 3,   # Video
-            4: 4,   # Contact
-            5: 5,   # Location
-            7: 9,   # Document
-            8: 2,   # Audio
-            9: 9,   # Document
-            13: 13, # GIF
-            14: 2,  # Voice note
-            15: 1,  # Image
-            20: 20, # Sticker
-            26: 3,  # Video note
-            42: 9,  # Product
-            43: 9,  # Order
-        }
-        
-        return type_map.get(int(msg_type), 0)
+        return self.MESSAGE_TYPE_TO_MEDIA.get(int(msg_type), 0)
+    
+    def _media_type_case_sql(self, column='m.message_type'):
+        """SQL CASE version of _map_message_type_to_media (NULL / unknown -> 0)"""
+        whens = ' '.join(f'WHEN {code} THEN {media}' for code, media in self.MESSAGE_TYPE_TO_MEDIA.items())
+        return f'CASE {column} {whens} ELSE 0 END'
+    
+    LID_MAP_QUERY = """
+    SELECT 
+        lid.raw_string as lid_jid,
+        jid.raw_string as normal_jid
+    FROM jid_map jm
+    JOIN jid lid ON jm.lid_row_id = lid._id
+    JOIN jid jid ON jm.jid_row_id = jid._id
+    """
+    
+    @property
+    def lid_map_df(self):
+        """LID -> normal JID map, read from msgstore on first access"""
+        if self._lid_map_df is None and self.msgstore_conn is not None:
+            if self._has_jid_map is None:
+                self._has_jid_map = self._has_table('jid_map')
+            if not self._has_jid_map:
+                # Older schema without jid_map: nothing to map, no query
+                self._lid_map_df = pd.DataFrame()
+                return self._lid_map_df
+            try:
+                self._lid_map_df = pd.read_sql_query(self.LID_MAP_QUERY, self.msgstore_conn)
+            except Exception as lid_error:
+                self._log(f"   ⚠️ LID mapping failed: {lid_error}")
+                self._lid_map_df = pd.DataFrame()
+        return self._lid_map_df
     
     def get_contacts(self):
         """Fetch contact list"""
@@ -167,50 +361,33 @@ class WhatsAppDatabaseReader:
                 """
                 df = pd.read_sql_query(query, self.wa_conn)
                 
-                # Get LID -> normal JID mapping from msgstore
-                try:
-                    lid_map_query = """
-                    SELECT 
-                        lid.raw_string as lid_jid,
-                        jid.raw_string as normal_jid
-                    FROM jid_map jm
-                    JOIN jid lid ON jm.lid_row_id = lid._id
-                    JOIN jid jid ON jm.jid_row_id = jid._id
-                    """
-                    lid_map = pd.read_sql_query(lid_map_query, self.msgstore_conn)
-                    
-                    # Save LID map (for analyzer)
-                    self.lid_map_df = lid_map
-                    
-                    # Create LID -> name mapping
-                    lid_to_normal = dict(zip(lid_map['lid_jid'], lid_map['normal_jid']))
-                    
-                    # Find name from wa_contacts for each LID
-                    lid_contacts = []
-                    for lid_jid, normal_jid in lid_to_normal.items():
-                        contact = df[df['jid'] == normal_jid]
-                        if not contact.empty:
-                            lid_contacts.append({
-                                'jid': lid_jid,
-                                'display_name': contact.iloc[0]['display_name'],
-                                'given_name': contact.iloc[0]['given_name'],
-                                'status': contact.iloc[0]['status']
-                            })
-                    
-                    # Add LID contacts
-                    if lid_contacts:
-                        lid_df = pd.DataFrame(lid_contacts)
-                        df = pd.concat([df, lid_df], ignore_index=True)
-                    
-                    print(f"✅ {len(df)} contacts loaded (with LID mapping)")
-                except Exception as lid_error:
-                    print(f"   ⚠️ LID mapping failed: {lid_error}")
-                    print(f"✅ {len(df)} contacts loaded")
-                    self.lid_map_df = pd.DataFrame()
+                # Get LID -> normal JID mapping from msgstore (loaded lazily)
+                lid_map = self.lid_map_df
+                if lid_map is None or lid_map.empty:
+                    self._log(f"✅ {len(df)} contacts loaded")
+                    return df
                 
+                # Create LID -> name mapping
+                lid_to_normal = pd.DataFrame(
+                    list(dict(zip(lid_map['lid_jid'], lid_map['normal_jid'])).items()),
+                    columns=['jid', 'normal_jid']
+                )
+                
+                # Find name from wa_contacts for each LID (first contact row per JID)
+                contacts_by_jid = df.dropna(subset=['jid']).drop_duplicates('jid')
+                lid_df = lid_to_normal.merge(
+                    contacts_by_jid.rename(columns={'jid': 'normal_jid'}),
+                    on='normal_jid', how='inner'
+                )[['jid', 'display_name', 'given_name', 'status']]
+                
+                # Add LID contacts
+                if not lid_df.empty:
+                    df = pd.concat([df, lid_df], ignore_index=True)
+                
+                self._log(f"✅ {len(df)} contacts loaded (with LID mapping)")
                 return df
             else:
-                # msgstore'dan jid tablosunu kullan
+                # msgstore'dan jid tablosunu kullan (LID map'i lid_map_df ilk erisimde okunur)
                 query = """
                 SELECT 
                     j._id as jid_row_id,
@@ -221,25 +398,11 @@ class WhatsAppDatabaseReader:
                 """
                 df = pd.read_sql_query(query, self.msgstore_conn)
                 
-                # LID map'i al (wa.db olmasa da)
-                try:
-                    lid_map_query = """
-                    SELECT 
-                        lid.raw_string as lid_jid,
-                        jid.raw_string as normal_jid
-                    FROM jid_map jm
-                    JOIN jid lid ON jm.lid_row_id = lid._id
-                    JOIN jid jid ON jm.jid_row_id = jid._id
-                    """
-                    self.lid_map_df = pd.read_sql_query(lid_map_query, self.msgstore_conn)
-                except:
-                    self.lid_map_df = pd.DataFrame()
-                
-                print(f"✅ {len(df)} JID records loaded (no wa.db)")
+                self._log(f"✅ {len(df)} JID records loaded (no wa.db)")
                 return df
                 
         except Exception as e:
-            print(f"⚠️ Contact reading error: {e}")
+            self._log(f"⚠️ Contact reading error: {e}")
             return pd.DataFrame()
     
     def get_groups(self):
@@ -266,11 +429,11 @@ class WhatsAppDatabaseReader:
             else:
                 df['group_name'] = df['group_id'].str.split('@').str[0]
             
-            print(f"✅ {len(df)} groups found")
+            self._log(f"✅ {len(df)} groups found")
             return df
                 
         except Exception as e:
-            print(f"⚠️ Group reading error: {e}")
+            self._log(f"⚠️ Group reading error: {e}")
             return pd.DataFrame()
     
     def get_group_participants(self):
@@ -285,19 +448,29 @@ class WhatsAppDatabaseReader:
                 FROM group_participants
                 """
                 df = pd.read_sql_query(query, self.wa_conn)
-                print(f"✅ {len(df)} group member records loaded")
+                self._log(f"✅ {len(df)} group member records loaded")
                 return df
             else:
-                print("⚠️ No wa.db, cannot determine group members")
+                self._log("⚠️ No wa.db, cannot determine group members")
                 return pd.DataFrame()
                 
         except Exception as e:
-            print(f"⚠️ Group member reading error: {e}")
+            self._log(f"⚠️ Group member reading error: {e}")
             return pd.DataFrame()
     
-    def get_media_info(self):
-        """Fetch media file information"""
+    def get_media_info(self, chunksize=None):
+        """Fetch media file information
+        
+        Args:
+            chunksize: verilirse tek DataFrame yerine chunk'lar halinde iterator doner
+        """
         try:
+            # Messages were already read together with message_media: reuse them once, then drop
+            # the reference so the reader does not keep a second copy of the message table alive
+            if not chunksize and self._messages_with_media is not None:
+                messages, self._messages_with_media = self._messages_with_media, None
+                return self._media_info_from_messages(messages)
+            
             # message_media tablosundan medya bilgilerini al
             query = """
             SELECT 
@@ -311,13 +484,16 @@ class WhatsAppDatabaseReader:
             LEFT JOIN message_media AS mm ON m._id = mm.message_row_id
             WHERE m.message_type > 0
             """
+            if chunksize:
+                return self._iter_media_chunks(query, chunksize)
+            
             df = pd.read_sql_query(query, self.msgstore_conn)
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', errors='coerce')
-            print(f"✅ {len(df)} media records loaded")
+            df['datetime'] = self._ms_to_datetime(df['timestamp'])
+            self._log(f"✅ {len(df)} media records loaded")
             return df
             
         except Exception as e:
-            print(f"⚠️ Media reading error: {e}")
+            self._log(f"⚠️ Media reading error: {e}")
             # Alternatif: sadece message tablosundan
             try:
                 query = """
@@ -329,12 +505,74 @@ class WhatsAppDatabaseReader:
                 WHERE message_type > 0
                 """
                 df = pd.read_sql_query(query, self.msgstore_conn)
-                df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', errors='coerce')
-                print(f"✅ {len(df)} media records loaded (basic)")
+                df['datetime'] = self._ms_to_datetime(df['timestamp'])
+                self._log(f"✅ {len(df)} media records loaded (basic)")
                 return df
             except:
                 return pd.DataFrame()
     
+    def _media_info_from_messages(self, messages):
+        """Build the get_media_info frame from a get_messages_with_media result"""
+        media = messages.loc[messages['message_type'] > 0, [
+            'message_id', 'message_type', 'media_size', 'media_name',
+            'media_mime_type', 'timestamp', 'datetime'
+        ]].rename(columns={'message_type': 'media_type'}).reset_index(drop=True)
+        self._log(f"✅ {len(media)} media records loaded (from messages)")
+        return media
+    
+    def _iter_media_chunks(self, query, chunksize):
+        """Yield media info chunks with their datetime column"""
+        for chunk in pd.read_sql_query(query, self.msgstore_conn, chunksize=chunksize):
+            chunk['datetime'] = self._ms_to_datetime(chunk['timestamp'])
+            yield chunk
+    
+    def _fork(self):
+        """Reader on new connections to the same files (sqlite3 connections are not shared between threads)"""
+        clone = WhatsAppDatabaseReader(self.msgstore_path, self.wa_db_path)
+        clone.msgstore_conn = self._open_read_only(self.msgstore_path)
+        self._apply_read_pragmas(clone.msgstore_conn, self.msgstore_path)
+        if self.wa_conn:
+            clone.wa_conn = self._open_read_only(self.wa_db_path)
+            self._apply_read_pragmas(clone.wa_conn, self.wa_db_path)
+        clone._has_sender_jid = self._has_sender_jid
+        clone._has_jid_map = self._has_jid_map
+        return clone
+    
+    def read_all(self):
+        """Read messages, contacts and groups in parallel, then the media info
+        
+        Returns:
+            (messages_df, contacts_df, groups_df, media_df)
+        """
+        def run_on_fork(method_name):
+            # Workers collect their status lines; they are printed in task order below
+            clone = self._fork()
+            log_lines = []
+            clone._log = log_lines.append
+            try:
+                return clone, getattr(clone, method_name)(), log_lines
+            finally:
+                clone.close()
+        
+        tasks = ['get_messages_with_media', 'get_contacts', 'get_groups']
+        results = []
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = [executor.submit(run_on_fork, method_name) for method_name in tasks]
+            for future in futures:
+                clone, df, log_lines = future.result()
+                for line in log_lines:
+                    print(line)
+                results.append((clone, df))
+        (messages_reader, messages_df), (contacts_reader, contacts_df), (_, groups_df) = results
+        
+        # Keep the state the workers built (media source, LID map) on this reader
+        self._messages_with_media = messages_reader._messages_with_media
+        if contacts_reader._lid_map_df is not None:
+            self._lid_map_df = contacts_reader._lid_map_df
+        
+        media_df = self.get_media_info()
+        return messages_df, contacts_df, groups_df, media_df
+    
     def get_table_info(self):
         """Show database table structure (for debugging)"""
         try:
@@ -365,25 +603,21 @@ def test_reader():
         print("Usage: reader = WhatsAppDatabaseReader('msgstore.db', 'wa.db')")
         return
     
-    reader = WhatsAppDatabaseReader(msgstore, wa_db)
-    reader.connect()
-    
-    # Show table structure
-    reader.get_table_info()
-    
-    # Fetch data
-    messages = reader.get_messages()
-    contacts = reader.get_contacts()
-    groups = reader.get_groups()
-    media = reader.get_media_info()
+    with WhatsAppDatabaseReader(msgstore, wa_db) as reader:
+        # Show table structure
+        reader.get_table_info()
+        
+        # Fetch data
+        messages = reader.get_messages_with_media()
+        contacts = reader.get_contacts()
+        groups = reader.get_groups()
+        media = reader.get_media_info()
     
     print(f"\n📊 Summary:")
     print(f"  Messages: {len(messages)}")
     print(f"  Contacts: {len(contacts)}")
     print(f"  Groups: {len(groups)}")
     print(f"  Media: {len(media)}")
-    
-    reader.close()
 
 
 if __name__ == "__main__":
@@ -10,9 +10,8 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 
-from database_reader import WhatsAppDatabaseReader
-from analyzer import WhatsAppAnalyzer
-from report_generator import ReportGenerator
+# database_reader / analyzer / report_generator (pandas, plotly) are imported
+# in WhatsAppAnalyzerApp.run(), so --help and --version do not pay for them
 
 
 class WhatsAppAnalyzerApp:
@@ -35,14 +34,19 @@ class WhatsAppAnalyzerApp:
     
     def validate_files(self):
         """Check file existence"""
-        if not os.path.exists(self.msgstore_path):
+        try:
+            os.stat(self.msgstore_path)
+        except OSError:
             print(f"❌ Error: msgstore.db file not found: {self.msgstore_path}")
             return False
         
-        if self.wa_db_path and not os.path.exists(self.wa_db_path):
-            print(f"⚠️ Warning: wa.db file not found: {self.wa_db_path}")
-            print("   Group analysis will be limited, continuing...")
-            self.wa_db_path = None
+        if self.wa_db_path:
+            try:
+                os.stat(self.wa_db_path)
+            except OSError:
+                print(f"⚠️ Warning: wa.db file not found: {self.wa_db_path}")
+                print("   Group analysis will be limited, continuing...")
+                self.wa_db_path = None
         
         return True
     
@@ -57,17 +61,20 @@ class WhatsAppAnalyzerApp:
         if not self.validate_files():
             return False
         
+        from database_reader import WhatsAppDatabaseReader
+        from analyzer import WhatsAppAnalyzer
+        from report_generator import ReportGenerator
+        
         try:
             # 1. Read database
             print("📖 1/4 - Reading database...")
             print("-" * 70)
+            sys.stdout.flush()
             self.reader = WhatsAppDatabaseReader(self.msgstore_path, self.wa_db_path)
             self.reader.connect()
             
-            messages_df = self.reader.get_messages()
-            contacts_df = self.reader.get_contacts()
-            groups_df = self.reader.get_groups()
-            media_df = self.reader.get_media_info()
+            # messages / contacts / groups are read in parallel on separate connections
+            messages_df, contacts_df, groups_df, media_df = self.reader.read_all()
             
             if messages_df.empty:
                 print("❌ Error: Message data could not be read!")
@@ -81,6 +88,7 @@ class WhatsAppAnalyzerApp:
             # 2. Analiz yap
             print("🔍 2/4 - Analyzing data...")
             print("-" * 70)
+            sys.stdout.flush()
             
             # Get LID map (if available)
             lid_map_df = getattr(self.reader, 'lid_map_df', None)
@@ -105,6 +113,7 @@ class WhatsAppAnalyzerApp:
             # 3. Generate report
             print("📝 3/4 - Generating HTML report...")
             print("-" * 70)
+            sys.stdout.flush()
             self.report_generator = ReportGenerator(self.analyzer, self.output_file)
             output_path = self.report_generator.generate_html_report()
             print()
@@ -114,16 +123,15 @@ class WhatsAppAnalyzerApp:
             print("=" * 70)
             print()
             print(f"🎉 Report successfully created!")
-            print(f"📄 File: {os.path.abspath(output_path)}")
-            print(f"📊 File size: {os.path.getsize(output_path) / 1024:.2f} KB")
+            abs_output_path = os.path.abspath(output_path)
+            output_size = os.stat(output_path).st_size
+            print(f"📄 File: {abs_output_path}")
+            print(f"📊 File size: {output_size / 1024:.2f} KB")
             print()
             print("💡 Open the report in your browser:")
-            print(f"   file://{os.path.abspath(output_path)}")
+            print(f"   file://{abs_output_path}")
             print()
             
-            # Close database connection
-            self.reader.close()
-            
             return True
             
         except KeyboardInterrupt:
@@ -132,17 +140,37 @@ class WhatsAppAnalyzerApp:
         
         except Exception as e:
             print(f"\n❌ Error occurred: {e}")
-            import traceback
-            traceback.print_exc()
+            # Full traceback only when debugging (WA_DEBUG=1)
+            if os.environ.get('WA_DEBUG'):
+                sys.stdout.flush()  # keep the message before the traceback on stderr
+                import traceback
+                traceback.print_exception(type(e), e, e.__traceback__, limit=5, file=sys.stderr)
+            else:
+                print("   (set WA_DEBUG=1 to see the traceback)")
             return False
         
         finally:
-            if self.reader:
+            # Close database connection (only place it is closed)
+            if self.reader is not None and self.reader.msgstore_conn is not None:
                 self.reader.close()
 
 
-def main():
-    """Command line interface"""
+def _parse_args_fast(argv):
+    """Fast path for the common 'msgstore [-w wa.db] [-o report.html]' call (None -> use argparse)"""
+    if not argv or argv[0].startswith('-') or len(argv) % 2 == 0:
+        return None
+    
+    args = argparse.Namespace(msgstore=argv[0], wa_db=None, output='report.html')
+    options = {'-w': 'wa_db', '--wa-db': 'wa_db', '-o': 'output', '--output': 'output'}
+    for flag, value in zip(argv[1::2], argv[2::2]):
+        if flag not in options or value.startswith('-'):
+            return None
+        setattr(args, options[flag], value)
+    return args
+
+
+def _parse_args():
+    """Full argparse parser (help, version, errors and unusual argument orders)"""
     parser = argparse.ArgumentParser(
         description='WhatsApp Database Analyzer - Generates detailed HTML reports',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -203,7 +231,16 @@ Notlar:
         print("=" * 70)
         sys.exit(0)
     
-    args = parser.parse_args()
+    return parser.parse_args()
+
+
+def main():
+    """Command line interface"""
+    args = _parse_args_fast(sys.argv[1:]) or _parse_args()
+    
+    # Progress output is block-buffered; run() flushes once per phase instead of per line
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
     
     # Run application
     app = WhatsAppAnalyzerApp(
@@ -213,6 +250,7 @@ Notlar:
     )
     
     success = app.run()
+    sys.stdout.flush()
     sys.exit(0 if success else 1)
 
 
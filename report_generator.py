@@ -3,476 +3,278 @@ WhatsApp HTML Report Generator Module
 Visualizes all analyses and exports to a single HTML file
 """
 
-import base64
-from io import BytesIO
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # For running without GUI
-import seaborn as sns
+import html
+try:
+    import orjson  # fast JSON encoder (optional, falls back to stdlib json)
+except ImportError:
+    orjson = None
 import plotly.graph_objects as go
-import plotly.express as px
-from wordcloud import WordCloud
+from plotly.colors import qualitative
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
 import pandas as pd
 import numpy as np
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# pandas display options
-pd.notna = pd.notna
+# Chart palette / dark theme shared by all Plotly charts
+_SET3 = tuple(qualitative.Set3)
+_DARK_LAYOUT = dict(paper_bgcolor='#1a1a1a', plot_bgcolor='#1a1a1a', font=dict(color='#e0e0e0'))
 
+# Message direction label / color, indexed by from_me (0 = received, 1 = sent)
+_DIRECTION = ('← Received', '→ Sent')
+_DIRECTION_COLOR = ('#34B7F1', '#25D366')
 
-class ReportGenerator:
-    """Class that generates HTML reports"""
-    
-    def __init__(self, analyzer, output_file='report.html'):
-        """
-        Args:
-            analyzer: WhatsAppAnalyzer nesnesi
-            output_file: Output HTML filename
-        """
-        self.analyzer = analyzer
-        self.output_file = output_file
-        self.plots = []
-        
-        # Renk paleti
-        self.colors = {
-            'primary': '#25D366',  # WhatsApp green
-            'secondary': '#128C7E',
-            'background': '#0a0a0a',
-            'card': '#1a1a1a',
-            'text': '#e0e0e0',
-            'accent': '#34B7F1'
+# Renders lazy chart placeholders once they get near the viewport
+_LAZY_PLOTS_JS = """<script>
+    (function () {
+        function render(div) {
+            if (div.dataset.done) return;
+            div.dataset.done = '1';
+            const spec = JSON.parse(document.getElementById(div.id + '_spec').textContent);
+            spec.config = {responsive: true};
+            Plotly.newPlot(div.id, spec);
         }
-    
-    def matplotlib_to_base64(self, fig):
-        """Convert matplotlib figure to base64"""
-        buffer = BytesIO()
-        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight', 
-                    facecolor='#1a1a1a', edgecolor='none')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.read()).decode()
-        plt.close(fig)
-        return f"data:image/png;base64,{img_base64}"
-    
-    def plotly_to_html(self, fig):
-        """Convert Plotly figure to HTML"""
-        return fig.to_html(include_plotlyjs='cdn', div_id=f'plot_{len(self.plots)}')
-    
-    def create_message_type_pie_chart(self, distribution):
-        """Message type distribution pie chart"""
-        # Filter zeros
-        filtered = {k: v for k, v in distribution.items() if v > 0}
-        
-        if not filtered:
-            return None
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=list(filtered.keys()),
-            values=list(filtered.values()),
-            hole=0.3,
-            marker=dict(colors=px.colors.qualitative.Set3)
-        )])
-        
-        fig.update_layout(
-            title="Message Type Distribution",
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0', size=12),
-            height=400
-        )
-        
-        return self.plotly_to_html(fig)
-    
-    def create_monthly_line_chart(self, monthly_df):
-        """Monthly message chart"""
-        if monthly_df.empty:
-            return None
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=monthly_df['month'],
-            y=monthly_df['count'],
-            mode='lines+markers',
-            line=dict(color='#25D366', width=3),
-            marker=dict(size=6)
-        ))
-        
-        fig.update_layout(
-            title="Message Activity by Month",
-            xaxis_title="Month",
-            yaxis_title="Message Count",
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0'),
-            height=400,
-            hovermode='x unified'
-        )
-        
-        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#333')
-        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#333')
-        
-        return self.plotly_to_html(fig)
-    
-    def create_hourly_bar_chart(self, hourly_df):
-        """Hourly message distribution bar chart"""
-        if hourly_df.empty:
-            return None
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=hourly_df['hour'],
-            y=hourly_df['count'],
-            marker=dict(color='#34B7F1')
-        ))
-        
-        fig.update_layout(
-            title="Message Intensity by Hour",
-            xaxis_title="Hour",
-            yaxis_title="Message Count",
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0'),
-            height=400
-        )
-        
-        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#333')
-        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#333')
-        
-        return self.plotly_to_html(fig)
-    
-    def create_day_of_week_chart(self, daily_df):
-        """Message distribution by day of week"""
-        if daily_df.empty:
-            return None
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=daily_df['day_name'],
-            y=daily_df['count'],
-            marker=dict(color='#128C7E')
-        ))
-        
-        fig.update_layout(
-            title="Message Distribution by Day of Week",
-            xaxis_title="Day",
-            yaxis_title="Message Count",
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0'),
-            height=400
-        )
-        
-        return self.plotly_to_html(fig)
-    
-    def create_heatmap(self, heatmap_data):
-        """Activity heatmap (day x hour)"""
-        if heatmap_data.empty:
-            return None
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.values,
-            x=heatmap_data.columns,
-            y=heatmap_data.index,
-            colorscale='Greens',
-            hoverongaps=False
-        ))
-        
-        fig.update_layout(
-            title="Activity Heatmap (Day × Hour)",
-            xaxis_title="Hour",
-            yaxis_title="Day",
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0'),
-            height=500
-        )
-        
-        return self.plotly_to_html(fig)
-    
-    def create_wordcloud(self, word_freq_df):
-        """Create word cloud"""
-        if word_freq_df.empty or len(word_freq_df) == 0:
-            return None
-        
-        try:
-            # Create word frequency dictionary
-            word_dict = dict(zip(word_freq_df['word'], word_freq_df['frequency']))
-            
-            # Create WordCloud
-            wordcloud = WordCloud(
-                width=1200, 
-                height=600,
-                background_color='#1a1a1a',
-                colormap='viridis',
-                max_words=100,
-                relative_scaling=0.5,
-                min_font_size=10
-            ).generate_from_frequencies(word_dict)
-            
-            # Create matplotlib figure
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor='#1a1a1a')
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            ax.set_facecolor('#1a1a1a')
-            plt.tight_layout(pad=0)
-            
-            return self.matplotlib_to_base64(fig)
-            
-        except Exception as e:
-            print(f"⚠️ Failed to create word cloud: {e}")
-            return None
-    
-    def create_top_contacts_chart(self, top_contacts_df):
-        """Most messaged contacts chart"""
-        if top_contacts_df.empty:
-            return None
-        
-        top_10 = top_contacts_df.head(10)
-        
-        fig = go.Figure()
         
-        fig.add_trace(go.Bar(
-            name='Sent',
-            x=top_10['contact_name'],
-            y=top_10['sent_by_me'],
-            marker=dict(color='#25D366')
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Received',
-            x=top_10['contact_name'],
-            y=top_10['received'],
-            marker=dict(color='#34B7F1')
-        ))
-        
-        fig.update_layout(
-            title="Top Contacts (Sent vs Received)",
-            xaxis_title="Contact",
-            yaxis_title="Message Count",
-            barmode='stack',
-            paper_bgcolor='#1a1a1a',
-            plot_bgcolor='#1a1a1a',
-            font=dict(color='#e0e0e0'),
-            height=500,
-            xaxis_tickangle=-45
-        )
-        
-        return self.plotly_to_html(fig)
-    
-    def generate_html_report(self):
-        """Generate main HTML report"""
-        print("📝 Creating HTML report...")
-        
-        # Run analyses
-        general_stats = self.analyzer.get_general_statistics()
-        msg_distribution = self.analyzer.get_message_type_distribution()
-        monthly_data = self.analyzer.get_messages_by_month()
-        hourly_data = self.analyzer.get_messages_by_hour()
-        daily_data = self.analyzer.get_messages_by_day_of_week()
-        top_contacts = self.analyzer.get_top_contacts(20)
-        group_stats = self.analyzer.get_group_statistics()
-        media_stats = self.analyzer.get_media_statistics()
-        top_media_senders = self.analyzer.get_top_media_senders(10)
-        word_freq = self.analyzer.get_word_frequency(50)
-        emoji_stats = self.analyzer.get_emoji_statistics(30)
-        msg_length = self.analyzer.get_message_length_stats()
-        heatmap_data = self.analyzer.get_activity_heatmap_data()
-        deleted_count = self.analyzer.get_deleted_messages_count()
-        
-        # Detailed analyses
-        longest_messages = self.analyzer.get_longest_messages(10)
-        recent_messages = self.analyzer.get_recent_messages(30)
-        first_messages = self.analyzer.get_first_messages(20)
-        response_time_stats = self.analyzer.get_message_response_time_analysis()
-        
-        # Create charts
-        print("📊 Creating charts...")
-        pie_chart = self.create_message_type_pie_chart(msg_distribution)
-        monthly_chart = self.create_monthly_line_chart(monthly_data)
-        hourly_chart = self.create_hourly_bar_chart(hourly_data)
-        daily_chart = self.create_day_of_week_chart(daily_data)
-        heatmap_chart = self.create_heatmap(heatmap_data)
-        contacts_chart = self.create_top_contacts_chart(top_contacts)
-        wordcloud_img = self.create_wordcloud(word_freq)
+        const plots = document.querySelectorAll('.lazy-plot');
+        if (!('IntersectionObserver' in window)) {
+            plots.forEach(render);
+            return;
+        }
         
-        # Generate HTML content
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>WhatsApp Analiz Raporu</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <style>
-        * {{
+        const observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    render(entry.target);
+                    observer.unobserve(entry.target);
+                }
+            });
+        }, {rootMargin: '200px'});
+        plots.forEach(div => observer.observe(div));
+    })();
+    </script>"""
+
+# Table row templates (filled with str.format_map from pre-formatted string columns)
+_CONTACT_ROW_TMPL = '''<tr>
+                <td>{rank}</td>
+                <td><strong>{contact_name}</strong></td>
+                <td>{total}</td>
+                <td style="color: #25D366;">{sent}</td>
+                <td style="color: #34B7F1;">{received}</td>
+                <td>{balance}</td>
+                <td>{last_msg}</td>
+            </tr>'''
+
+_GROUP_ROW_TMPL = '''<tr>
+                <td>{rank}</td>
+                <td><strong>{group_name}</strong></td>
+                <td>{total}</td>
+                <td>{first_msg}</td>
+                <td>{last_msg}</td>
+            </tr>'''
+
+_MEDIA_ROW_TMPL = '''<tr>
+                <td>{rank}</td>
+                <td><strong>{contact_name}</strong></td>
+                <td>{images}</td>
+                <td>{audio}</td>
+                <td>{videos}</td>
+                <td style="color: #25D366; font-weight: bold;">{total}</td>
+            </tr>'''
+
+_WORD_ROW_TMPL = '''<tr>
+                    <td>{rank}</td>
+                    <td><strong>{word}</strong></td>
+                    <td>{freq}</td>
+                </tr>'''
+
+# Message card templates for the message details section
+_LONGEST_MSG_TMPL = '''<div style="background: #252525; padding: 15px; margin: 10px 0; border-radius: 10px; border-left: 3px solid #25D366;">
+                    <div style="color: #888; font-size: 0.9em; margin-bottom: 5px;">Length: {length} characters</div>
+                    <div style="color: #e0e0e0;">{text}...</div>
+                </div>'''
+
+_MESSAGE_CARD_TMPL = '''<div style="background: #252525; padding: 12px; margin: 8px 0; border-radius: 8px; border-left: 3px solid {color};">
+                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                        <span style="color: {color}; font-weight: bold;">{contact_name}</span>
+                        <span style="color: #888; font-size: 0.85em;">{datetime}</span>
+                    </div>
+                    <div style="color: #888; font-size: 0.85em; margin-bottom: 5px;">{direction}</div>
+                    <div style="color: #e0e0e0;">{text}</div>
+                </div>'''
+
+# Report stylesheet, built once at import and written out as-is
+_REPORT_CSS = """
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 100%);
             color: #e0e0e0;
             padding: 20px;
             line-height: 1.6;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
-        header {{
+        header {
             background: linear-gradient(135deg, #128C7E 0%, #25D366 100%);
             padding: 40px;
             border-radius: 20px;
             text-align: center;
             margin-bottom: 40px;
             box-shadow: 0 10px 40px rgba(37, 211, 102, 0.3);
-        }}
+        }
         
-        header h1 {{
+        header h1 {
             font-size: 3em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
+        }
         
-        header p {{
+        header p {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
         
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: #1a1a1a;
             padding: 25px;
             border-radius: 15px;
             border-left: 5px solid #25D366;
             box-shadow: 0 5px 15px rgba(0,0,0,0.3);
             transition: transform 0.3s, box-shadow 0.3s;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 10px 25px rgba(37, 211, 102, 0.2);
-        }}
+        }
         
-        .stat-card h3 {{
+        .stat-card h3 {
             color: #25D366;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 10px;
-        }}
+        }
         
-        .stat-card .value {{
+        .stat-card .value {
             font-size: 2.5em;
             font-weight: bold;
             color: #fff;
-        }}
+        }
         
-        .stat-card .label {{
+        .stat-card .label {
             font-size: 0.9em;
             color: #888;
             margin-top: 5px;
-        }}
+        }
         
-        .section {{
+        .section {
             background: #1a1a1a;
             padding: 30px;
             border-radius: 15px;
             margin-bottom: 30px;
             box-shadow: 0 5px 15px rgba(0,0,0,0.3);
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 2em;
             color: #25D366;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 2px solid #25D366;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 20px;
-        }}
+        }
         
-        table th {{
+        table th {
             background: #128C7E;
             color: white;
             padding: 15px;
             text-align: left;
             font-weight: bold;
-        }}
+        }
         
-        table td {{
+        table td {
             padding: 12px 15px;
             border-bottom: 1px solid #333;
-        }}
+        }
         
-        table tr:hover {{
+        table tr:hover {
             background: #252525;
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             margin: 30px 0;
             padding: 20px;
             background: #1a1a1a;
             border-radius: 10px;
-        }}
+        }
         
-        .wordcloud-container {{
+        .wordcloud-container {
             text-align: center;
             margin: 30px 0;
-        }}
+        }
         
-        .wordcloud-container img {{
+        .wordcloud-container img {
             max-width: 100%;
             border-radius: 10px;
             box-shadow: 0 5px 20px rgba(0,0,0,0.5);
-        }}
+        }
         
-        .emoji-grid {{
+        .emoji-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(100px, 1fr));
             gap: 15px;
             margin-top: 20px;
-        }}
+        }
         
-        .emoji-item {{
+        .emoji-item {
             background: #252525;
             padding: 15px;
             border-radius: 10px;
             text-align: center;
             transition: transform 0.2s;
-        }}
+        }
         
-        .emoji-item:hover {{
+        .emoji-item:hover {
             transform: scale(1.1);
-        }}
+        }
         
-        .emoji-item .emoji {{
+        .emoji-item .emoji {
             font-size: 2.5em;
             margin-bottom: 5px;
-        }}
+        }
         
-        .emoji-item .count {{
+        .emoji-item .count {
             font-size: 0.9em;
             color: #25D366;
             font-weight: bold;
-        }}
+        }
         
         /* WhatsApp Web-Style Conversation Interface */
-        .whatsapp-container {{
+        .whatsapp-container {
             display: flex;
             height: 700px;
             background: #0a0a0a;
@@ -480,191 +282,615 @@ class ReportGenerator:
             overflow: hidden;
             margin: 20px 0;
             box-shadow: 0 5px 30px rgba(0,0,0,0.5);
-        }}
+        }
         
-        .contacts-sidebar {{
+        .contacts-sidebar {
             width: 350px;
             background: #1a1a1a;
             border-right: 1px solid #333;
             overflow-y: auto;
-        }}
+        }
         
-        .contact-item {{
+        .contact-item {
             padding: 15px 20px;
             border-bottom: 1px solid #252525;
             cursor: pointer;
             transition: background 0.2s;
-        }}
+        }
         
-        .contact-item:hover {{
+        .contact-item:hover {
             background: #252525;
-        }}
+        }
         
-        .contact-item.active {{
+        .contact-item.active {
             background: #128C7E;
-        }}
+        }
         
-        .contact-item .name {{
+        .contact-item .name {
             font-weight: bold;
             color: #e0e0e0;
             margin-bottom: 5px;
-        }}
+        }
+        
+        .contact-item .preview {
+            font-size: 0.85em;
+            color: #888;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        
+        .contact-item .count {
+            font-size: 0.75em;
+            color: #25D366;
+        }
+        
+        .chat-area {
+            flex: 1;
+            display: flex;
+            flex-direction: column;
+            background: #0d1418;
+        }
+        
+        .chat-header {
+            background: #1a1a1a;
+            padding: 15px 20px;
+            border-bottom: 1px solid #333;
+        }
+        
+        .chat-header .name {
+            font-size: 1.2em;
+            font-weight: bold;
+            color: #e0e0e0;
+        }
+        
+        .chat-header .info {
+            font-size: 0.85em;
+            color: #888;
+            margin-top: 5px;
+        }
+        
+        .chat-messages {
+            flex: 1;
+            overflow-y: auto;
+            padding: 20px;
+            background: #0d1418;
+        }
+        
+        .chat-placeholder {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: center;
+            height: 100%;
+            color: #888;
+        }
+        
+        .chat-placeholder .icon {
+            font-size: 5em;
+            margin-bottom: 20px;
+            opacity: 0.3;
+        }
+        
+        .message-bubble {
+            margin: 8px 0;
+            display: flex;
+            animation: fadeIn 0.3s;
+        }
+        
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(10px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+        
+        .message-bubble.sent {
+            justify-content: flex-end;
+        }
+        
+        .message-bubble.received {
+            justify-content: flex-start;
+        }
+        
+        .message-content {
+            max-width: 65%;
+            padding: 10px 15px;
+            border-radius: 8px;
+            position: relative;
+        }
+        
+        .message-bubble.sent .message-content {
+            background: #056162;
+            color: white;
+            border-radius: 8px 8px 0 8px;
+        }
+        
+        .message-bubble.received .message-content {
+            background: #1f2c33;
+            color: #e0e0e0;
+            border-radius: 8px 8px 8px 0;
+        }
+        
+        .message-text {
+            word-wrap: break-word;
+            margin-bottom: 5px;
+        }
+        
+        .message-time {
+            font-size: 0.7em;
+            color: #8696a0;
+            text-align: right;
+        }
+        
+        .message-bubble.received .message-time {
+            color: #667781;
+        }
+        
+        .media-indicator {
+            display: inline-block;
+            padding: 5px 10px;
+            background: rgba(0,0,0,0.3);
+            border-radius: 5px;
+            font-size: 0.9em;
+            margin-bottom: 5px;
+        }
+        
+        .footer {
+            text-align: center;
+            margin-top: 50px;
+            padding: 30px;
+            color: #888;
+            font-size: 0.9em;
+        }
+        
+        .badge {
+            display: inline-block;
+            padding: 5px 15px;
+            border-radius: 20px;
+            background: #25D366;
+            color: white;
+            font-size: 0.85em;
+            font-weight: bold;
+            margin: 5px;
+        }
+        
+        @media (max-width: 768px) {
+            .stats-grid {
+                grid-template-columns: 1fr;
+            }
+            
+            header h1 {
+                font-size: 2em;
+            }
+            
+            .section {
+                padding: 20px;
+            }
+        }
+"""
+
+_CONVERSATIONS_JS = """<script>
+function showConversation(contactId, item) {
+    // Remove active class from all contacts
+    document.querySelectorAll('.contact-item').forEach(item => {
+        item.classList.remove('active');
+    });
+    
+    // Make clicked contact active
+    if (item) item.classList.add('active');
+    
+    // Get conversation data
+    const data = window.__convs[contactId];
+    if (!data) return;
+    
+    // Update header
+    const header = document.getElementById('chatHeader');
+    header.innerHTML = `
+        <div class="name">${data.name}</div>
+        <div class="info">
+            ${data.details.total_messages} messages • 
+            Sent: ${data.details.sent_by_me} • 
+            Received: ${data.details.received} • 
+            Media: ${data.details.media_count}
+        </div>
+    `;
+    
+    // Update messages
+    const messagesArea = document.getElementById('chatMessages');
+    messagesArea.innerHTML = '';
+    
+    const mediaTypes = {
+        0: 'Text', 1: '🖼️ Photo', 2: '🎵 Audio', 3: '🎥 Video',
+        4: '👤 Contact', 5: '📍 Location', 9: '📄 Document', 13: 'GIF', 20: '🎨 Sticker'
+    };
+    
+    const msgs = data.messages;
+    for (let i = 0; i < msgs.from_me.length; i++) {
+        const msgClass = msgs.from_me[i] === 1 ? 'sent' : 'received';
+        let msgText;
+        
+        if (msgs.text[i]) {
+            msgText = msgs.text[i];  // already escaped in Python
+        } else {
+            const mediaType = mediaTypes[msgs.media_type[i]] || 'Medya';
+            msgText = `<span class="media-indicator">${mediaType}</span>`;
+        }
+        
+        const bubble = document.createElement('div');
+        bubble.className = `message-bubble ${msgClass}`;
+        bubble.innerHTML = `
+            <div class="message-content">
+                <div class="message-text">${msgText}</div>
+                <div class="message-time">${msgs.time[i]}</div>
+            </div>
+        `;
+        messagesArea.appendChild(bubble);
+    }
+    
+    // En alta scroll
+    messagesArea.scrollTop = messagesArea.scrollHeight;
+}
+
+// Show first conversation on page load
+window.addEventListener('DOMContentLoaded', () => {
+    const firstId = Object.keys(window.__convs)[0];
+    if (firstId) {
+        showConversation(firstId, document.querySelector('.contact-item'));
+    }
+});
+</script>
+"""
+
+# Per-contact entry of the conversations payload; every field is filled with already-serialized JSON
+_CONVERSATION_JSON_TMPL = ('"{id}":{{"name":{name},"details":{details},'
+                           '"messages":{{"from_me":{from_me},"text":{text},"media_type":{media_type},"time":{time}}}}}')
+
+
+def _dumps_compact(obj):
+    """Compact JSON string (orjson if installed, else stdlib json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+
+
+def _escape_text(text):
+    """Mesaj metnini tek geçişte HTML-escape eder (&, <, >)"""
+    return html.escape(text, quote=False)
+
+
+# pandas display options
+pd.notna = pd.notna
+
+
+class ReportGenerator:
+    """Class that generates HTML reports"""
+    
+    def __init__(self, analyzer, output_file='report.html', lazy_charts=True):
+        """
+        Args:
+            analyzer: WhatsAppAnalyzer nesnesi
+            output_file: Output HTML filename
+            lazy_charts: Draw charts only when they scroll into view
+        """
+        self.analyzer = analyzer
+        self.output_file = output_file
+        self.lazy_charts = lazy_charts
+        self.plots = []
+        self._plots_lock = threading.Lock()  # grafikler paralel üretiliyor
+        self._contact_names = {}  # chat_id -> display name, filled on first use
+        
+        # Renk paleti
+        self.colors = {
+            'primary': '#25D366',  # WhatsApp green
+            'secondary': '#128C7E',
+            'background': '#0a0a0a',
+            'card': '#1a1a1a',
+            'text': '#e0e0e0',
+            'accent': '#34B7F1'
+        }
+    
+    def _contact_name(self, chat_id):
+        """analyzer.get_contact_name, memoized for the lifetime of this generator"""
+        name = self._contact_names.get(chat_id)
+        if name is None:
+            name = self._contact_names[chat_id] = self.analyzer.get_contact_name(chat_id)
+        return name
+    
+    def plotly_to_html(self, fig):
+        """Convert Plotly figure to an HTML div (plotly.js is loaded once in <head>)"""
+        with self._plots_lock:
+            div_id = f'plot_{len(self.plots)}'
+            self.plots.append(div_id)
+        # Figures are already valid; the 'auto' JSON engine picks orjson when it is installed
+        spec = pio.to_json(fig, validate=False)
+        
+        if self.lazy_charts:
+            # Drawn by _LAZY_PLOTS_JS when the placeholder scrolls into view
+            height = fig.layout.height or 450
+            return (f'<div id="{div_id}" class="plotly-graph-div lazy-plot" style="height:{height}px; width:100%;"></div>'
+                    f'<script type="application/json" id="{div_id}_spec">{spec}</script>')
+        
+        return (f'<div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+                f'<script>Plotly.newPlot("{div_id}", Object.assign({spec}, {{"config": {{"responsive": true}}}}));</script>')
+    
+    def create_message_type_pie_chart(self, distribution):
+        """Message type distribution pie chart"""
+        # Filter zeros
+        filtered = {k: v for k, v in distribution.items() if v > 0}
+        
+        if not filtered:
+            return None
+        
+        fig = go.Figure(data=[go.Pie(
+            labels=list(filtered.keys()),
+            values=np.fromiter(filtered.values(), dtype=np.int32, count=len(filtered)),
+            hole=0.3,
+            marker=dict(colors=_SET3)
+        )])
+        
+        fig.update_layout(
+            title="Message Type Distribution",
+            height=400,
+            **_DARK_LAYOUT
+        )
+        fig.update_layout(font_size=12)
+        
+        return self.plotly_to_html(fig)
+    
+    def create_monthly_line_chart(self, monthly_df):
+        """Monthly message chart"""
+        if monthly_df.empty:
+            return None
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=monthly_df['month'],
+            y=monthly_df['count'].to_numpy(np.int32),
+            mode='lines+markers',
+            line=dict(color='#25D366', width=3),
+            marker=dict(size=6)
+        ))
+        
+        fig.update_layout(
+            title="Message Activity by Month",
+            xaxis_title="Month",
+            yaxis_title="Message Count",
+            height=400,
+            hovermode='x unified',
+            **_DARK_LAYOUT
+        )
         
-        .contact-item .preview {{
-            font-size: 0.85em;
-            color: #888;
-            white-space: nowrap;
-            overflow: hidden;
-            text-overflow: ellipsis;
-        }}
+        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#333')
+        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#333')
         
-        .contact-item .count {{
-            font-size: 0.75em;
-            color: #25D366;
-        }}
+        return self.plotly_to_html(fig)
+    
+    def create_hourly_bar_chart(self, hourly_df):
+        """Hourly message distribution bar chart"""
+        if hourly_df.empty:
+            return None
         
-        .chat-area {{
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            background: #0d1418;
-        }}
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=hourly_df['hour'].to_numpy(np.int8),
+            y=hourly_df['count'].to_numpy(np.int32),
+            marker=dict(color='#34B7F1')
+        ))
         
-        .chat-header {{
-            background: #1a1a1a;
-            padding: 15px 20px;
-            border-bottom: 1px solid #333;
-        }}
+        fig.update_layout(
+            title="Message Intensity by Hour",
+            xaxis_title="Hour",
+            yaxis_title="Message Count",
+            height=400,
+            **_DARK_LAYOUT
+        )
         
-        .chat-header .name {{
-            font-size: 1.2em;
-            font-weight: bold;
-            color: #e0e0e0;
-        }}
+        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#333')
+        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#333')
         
-        .chat-header .info {{
-            font-size: 0.85em;
-            color: #888;
-            margin-top: 5px;
-        }}
+        return self.plotly_to_html(fig)
+    
+    def create_day_of_week_chart(self, daily_df):
+        """Message distribution by day of week"""
+        if daily_df.empty:
+            return None
         
-        .chat-messages {{
-            flex: 1;
-            overflow-y: auto;
-            padding: 20px;
-            background: #0d1418;
-        }}
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=daily_df['day_name'],
+            y=daily_df['count'].to_numpy(np.int32),
+            marker=dict(color='#128C7E')
+        ))
         
-        .chat-placeholder {{
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            height: 100%;
-            color: #888;
-        }}
+        fig.update_layout(
+            title="Message Distribution by Day of Week",
+            xaxis_title="Day",
+            yaxis_title="Message Count",
+            height=400,
+            **_DARK_LAYOUT
+        )
         
-        .chat-placeholder .icon {{
-            font-size: 5em;
-            margin-bottom: 20px;
-            opacity: 0.3;
-        }}
+        return self.plotly_to_html(fig)
+    
+    def create_heatmap(self, heatmap_data):
+        """Activity heatmap (day x hour)"""
+        if heatmap_data.empty:
+            return None
         
-        .message-bubble {{
-            margin: 8px 0;
-            display: flex;
-            animation: fadeIn 0.3s;
-        }}
+        fig = go.Figure(data=go.Heatmap(
+            z=heatmap_data.to_numpy(np.int32),
+            x=heatmap_data.columns.to_numpy(np.int8),
+            y=heatmap_data.index,
+            colorscale='Greens',
+            hoverongaps=False
+        ))
         
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        fig.update_layout(
+            title="Activity Heatmap (Day × Hour)",
+            xaxis_title="Hour",
+            yaxis_title="Day",
+            height=500,
+            **_DARK_LAYOUT
+        )
         
-        .message-bubble.sent {{
-            justify-content: flex-end;
-        }}
+        return self.plotly_to_html(fig)
+    
+    def _layout_words(self, words, sizes, width=1200, height=600):
+        """Place words on an outward spiral without overlapping boxes (canvas pixels, centre = 0,0)"""
+        box_w = np.array([0.6 * size * max(len(word), 1) for word, size in zip(words, sizes)])
+        box_h = np.asarray(sizes, dtype=float)
+        xs = np.zeros(len(words))
+        ys = np.zeros(len(words))
+        
+        # Candidate positions on an Archimedean spiral, stretched to the canvas aspect ratio
+        # (the first word sits at the centre)
+        t = np.arange(0, 4000) * 0.1
+        spiral_x = 4 * t * np.cos(t) * (width / height)
+        spiral_y = 4 * t * np.sin(t)
+        
+        block = 256
+        for i in range(1, len(words)):
+            half_w = (box_w[i] + box_w[:i]) / 2
+            half_h = (box_h[i] + box_h[:i]) / 2
+            k = len(t) - 1  # no free spot left: fall back to the outermost position
+            # Test a block of spiral positions against all placed boxes at once, take the first free one
+            for start in range(0, len(t), block):
+                cx = spiral_x[start:start + block, None]
+                cy = spiral_y[start:start + block, None]
+                hits = ((np.abs(cx - xs[:i]) < half_w) & (np.abs(cy - ys[:i]) < half_h)).any(axis=1)
+                free = np.flatnonzero(~hits)
+                if free.size:
+                    k = start + free[0]
+                    break
+            xs[i], ys[i] = spiral_x[k], spiral_y[k]
+        return xs, ys
+    
+    def create_wordcloud(self, word_freq_df):
+        """Create word cloud (Plotly text scatter, drawn in the browser)"""
+        if word_freq_df.empty or len(word_freq_df) == 0:
+            return None
         
-        .message-bubble.received {{
-            justify-content: flex-start;
-        }}
+        try:
+            words_df = word_freq_df.head(100)
+            words = words_df['word'].astype(str).tolist()
+            frequencies = words_df['frequency'].to_numpy(dtype=float)
+            
+            # Font size grows with the square root of the frequency; shrink all sizes
+            # if the words would cover more than ~45% of the 1200x600 canvas
+            sizes = np.sqrt(frequencies / frequencies.max()) * 60 + 10
+            word_area = float(np.sum(0.6 * sizes ** 2 * np.array([max(len(word), 1) for word in words])))
+            sizes *= min(1.0, np.sqrt(0.45 * 1200 * 600 / word_area))
+            xs, ys = self._layout_words(words, sizes)
+            
+            palette = _SET3
+            fig = go.Figure(go.Scatter(
+                x=xs.astype(np.float32),
+                y=ys.astype(np.float32),
+                mode='text',
+                text=words,
+                textfont=dict(size=sizes, color=[palette[i % len(palette)] for i in range(len(words))]),
+                hovertext=[f'{word}: {int(freq):,}' for word, freq in zip(words, frequencies)],
+                hoverinfo='text'
+            ))
+            
+            fig.update_layout(
+                paper_bgcolor='#1a1a1a',
+                plot_bgcolor='#1a1a1a',
+                height=600,
+                showlegend=False,
+                margin=dict(l=10, r=10, t=10, b=10),
+                xaxis=dict(visible=False, range=[-620, 620]),
+                yaxis=dict(visible=False, range=[-320, 320])
+            )
+            
+            return self.plotly_to_html(fig)
+            
+        except Exception as e:
+            print(f"⚠️ Failed to create word cloud: {e}")
+            return None
+    
+    def create_top_contacts_chart(self, top_contacts_df):
+        """Most messaged contacts chart"""
+        if top_contacts_df.empty:
+            return None
         
-        .message-content {{
-            max-width: 65%;
-            padding: 10px 15px;
-            border-radius: 8px;
-            position: relative;
-        }}
+        top_10 = top_contacts_df.head(10)
         
-        .message-bubble.sent .message-content {{
-            background: #056162;
-            color: white;
-            border-radius: 8px 8px 0 8px;
-        }}
+        fig = go.Figure()
         
-        .message-bubble.received .message-content {{
-            background: #1f2c33;
-            color: #e0e0e0;
-            border-radius: 8px 8px 8px 0;
-        }}
+        fig.add_trace(go.Bar(
+            name='Sent',
+            x=top_10['contact_name'],
+            y=top_10['sent_by_me'].to_numpy(np.int32),
+            marker=dict(color='#25D366')
+        ))
         
-        .message-text {{
-            word-wrap: break-word;
-            margin-bottom: 5px;
-        }}
+        fig.add_trace(go.Bar(
+            name='Received',
+            x=top_10['contact_name'],
+            y=top_10['received'].to_numpy(np.int32),
+            marker=dict(color='#34B7F1')
+        ))
         
-        .message-time {{
-            font-size: 0.7em;
-            color: #8696a0;
-            text-align: right;
-        }}
+        fig.update_layout(
+            title="Top Contacts (Sent vs Received)",
+            xaxis_title="Contact",
+            yaxis_title="Message Count",
+            barmode='stack',
+            height=500,
+            xaxis_tickangle=-45,
+            **_DARK_LAYOUT
+        )
         
-        .message-bubble.received .message-time {{
-            color: #667781;
-        }}
+        return self.plotly_to_html(fig)
+    
+    def generate_html_report(self):
+        """Generate main HTML report"""
+        print("📝 Creating HTML report...")
         
-        .media-indicator {{
-            display: inline-block;
-            padding: 5px 10px;
-            background: rgba(0,0,0,0.3);
-            border-radius: 5px;
-            font-size: 0.9em;
-            margin-bottom: 5px;
-        }}
+        # Run analyses
+        b = self.analyzer.get_report_bundle()
+        general_stats = b['general']
+        msg_distribution = b['msg_distribution']
+        top_contacts = b['top_contacts']
+        group_stats = b['group_stats']
+        media_stats = b['media_stats']
+        top_media_senders = b['top_media_senders']
+        word_freq = b['word_freq']
+        emoji_stats = b['emoji_stats']
+        msg_length = b['msg_length']
+        deleted_count = b['deleted_count']
         
-        .footer {{
-            text-align: center;
-            margin-top: 50px;
-            padding: 30px;
-            color: #888;
-            font-size: 0.9em;
-        }}
+        # Detailed analyses
+        longest_messages = b['longest_messages']
+        recent_messages = b['recent_messages']
+        first_messages = b['first_messages']
+        response_time_stats = b['response_time']
         
-        .badge {{
-            display: inline-block;
-            padding: 5px 15px;
-            border-radius: 20px;
-            background: #25D366;
-            color: white;
-            font-size: 0.85em;
-            font-weight: bold;
-            margin: 5px;
-        }}
+        # Create charts (only the ones the page embeds; the time/contact charts are
+        # available through the create_* methods but have no section in the report)
+        print("📊 Creating charts...")
+        chart_jobs = [
+            ('pie', self.create_message_type_pie_chart, msg_distribution),
+            ('wordcloud', self.create_wordcloud, word_freq),
+        ]
+        with ThreadPoolExecutor(max_workers=len(chart_jobs)) as ex:
+            futs = {name: ex.submit(fn, arg) for name, fn, arg in chart_jobs}
+        pie_chart = futs['pie'].result()
+        wordcloud_html = futs['wordcloud'].result()
         
-        @media (max-width: 768px) {{
-            .stats-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            header h1 {{
-                font-size: 2em;
-            }}
-            
-            .section {{
-                padding: 20px;
-            }}
-        }}
-    </style>
+        # Generate HTML content
+        # Write the page section by section, the full HTML string is never built
+        with open(self.output_file, 'w', encoding='utf-8', buffering=1 << 20) as out:
+            write = out.write
+            write(f"""
+<!DOCTYPE html>
+<html lang="tr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>WhatsApp Analiz Raporu</title>
+    <script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>
+    <style>{_REPORT_CSS}    </style>
 </head>
 <body>
     <div class="container">
@@ -674,7 +900,8 @@ class ReportGenerator:
             <p style="margin-top: 10px; font-size: 0.9em;">Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         </header>
         
-        <!-- GENERAL STATISTICS -->
+""")
+            write(f"""        <!-- GENERAL STATISTICS -->
         <div class="section">
             <h2 class="section-title">📊 General Statistics</h2>
             <div class="stats-grid">
@@ -717,7 +944,8 @@ class ReportGenerator:
             {f'<p><span class="badge">Deleted Messages: {deleted_count}</span></p>' if deleted_count > 0 else ''}
         </div>
         
-        <!-- MESSAGE TYPE DISTRIBUTION -->
+""")
+            write(f"""        <!-- MESSAGE TYPE DISTRIBUTION -->
         <div class="section">
             <h2 class="section-title">📝 Message Type Distribution</h2>
             <div class="chart-container">
@@ -728,10 +956,12 @@ class ReportGenerator:
             </div>
         </div>
         
-        <!-- GROUP ANALYSIS -->
+""")
+            write(f"""        <!-- GROUP ANALYSIS -->
         {self._generate_groups_section(group_stats) if not group_stats.empty else ''}
         
-        <!-- MEDIA ANALYSIS -->
+""")
+            write(f"""        <!-- MEDIA ANALYSIS -->
         <div class="section">
             <h2 class="section-title">🎬 Media Analysis</h2>
             <div class="stats-grid">
@@ -764,16 +994,20 @@ class ReportGenerator:
             {self._generate_media_senders_table(top_media_senders) if not top_media_senders.empty else ''}
         </div>
         
-        <!-- WORD ANALYSIS -->
-        {self._generate_word_analysis_section(word_freq, wordcloud_img, msg_length)}
+""")
+            write(f"""        <!-- WORD ANALYSIS -->
+        {self._generate_word_analysis_section(word_freq, wordcloud_html, msg_length)}
         
-        <!-- EMOJI ANALYSIS -->
+""")
+            write(f"""        <!-- EMOJI ANALYSIS -->
         {self._generate_emoji_section(emoji_stats) if not emoji_stats.empty else ''}
         
-        <!-- MESSAGE DETAILS -->
+""")
+            write(f"""        <!-- MESSAGE DETAILS -->
         {self._generate_message_details_section(longest_messages, recent_messages, first_messages, response_time_stats)}
         
-        <!-- CONVERSATIONS -->
+""")
+            write(f"""        <!-- CONVERSATIONS -->
         {self._generate_conversation_details_section(top_contacts)}
         
         <div class="footer">
@@ -781,289 +1015,254 @@ class ReportGenerator:
             <p>📊 WhatsApp Database Analyzer | Developed with Python</p>
         </div>
     </div>
+    {_LAZY_PLOTS_JS if self.lazy_charts else ''}
 </body>
 </html>
-"""
-        
-        # Save HTML file
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+""")
         
         print(f"✅ Report successfully created: {self.output_file}")
         return self.output_file
     
+    @staticmethod
+    def _format_dates(values, fmt='%Y-%m-%d'):
+        """Format a date column once for a whole table ('' for missing)"""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.dt.strftime(fmt).fillna('')
+        return values.fillna('').astype(str)
+    
+    @staticmethod
+    def _format_counts(values):
+        """Integer column -> '1,234' strings, formatted once for a whole table"""
+        return values.astype('int64').map('{:,}'.format)
+    
     def _generate_contacts_table(self, contacts_df):
         """Contacts table HTML"""
         if contacts_df.empty:
             return '<p>Contact data not found</p>'
         
-        html = '<table><thead><tr>'
-        html += '<th>Rank</th><th>Contact</th><th>Total Messages</th><th>Sent</th>'
-        html += '<th>Received</th><th>Balance Score</th><th>Last Message</th></tr></thead><tbody>'
+        parts = ['<table><thead><tr>']
+        parts.append('<th>Rank</th><th>Contact</th><th>Total Messages</th><th>Sent</th>')
+        parts.append('<th>Received</th><th>Balance Score</th><th>Last Message</th></tr></thead><tbody>')
         
-        for idx, row in contacts_df.head(20).iterrows():
-            last_msg = row.get('last_message', '')
-            if pd.notna(last_msg) and hasattr(last_msg, 'strftime'):
-                last_msg = last_msg.strftime('%Y-%m-%d')
-            
-            html += f'''<tr>
-                <td>{idx + 1}</td>
-                <td><strong>{row.get("contact_name", "Unknown")}</strong></td>
-                <td>{row.get("total_messages", 0):,}</td>
-                <td style="color: #25D366;">{row.get("sent_by_me", 0):,}</td>
-                <td style="color: #34B7F1;">{row.get("received", 0):,}</td>
-                <td>{row.get("balance_score", 0):.2f}</td>
-                <td>{last_msg}</td>
-            </tr>'''
+        top = contacts_df.head(20)
+        rows = zip(top.index + 1, top['contact_name'], self._format_counts(top['total_messages']),
+                   self._format_counts(top['sent_by_me']), self._format_counts(top['received']),
+                   top['balance_score'].map('{:.2f}'.format), self._format_dates(top['last_message']))
+        keys = ('rank', 'contact_name', 'total', 'sent', 'received', 'balance', 'last_msg')
+        for row in rows:
+            parts.append(_CONTACT_ROW_TMPL.format_map(dict(zip(keys, row))))
         
-        html += '</tbody></table>'
-        return html
+        parts.append('</tbody></table>')
+        return ''.join(parts)
     
     def _generate_groups_section(self, groups_df):
         """Groups section HTML"""
         if groups_df.empty:
             return ''
         
-        html = '<div class="section"><h2 class="section-title">👥 Group Analysis</h2>'
-        html += '<table><thead><tr><th>Rank</th><th>Group Name</th><th>Total Messages</th>'
-        html += '<th>First Message</th><th>Last Message</th></tr></thead><tbody>'
+        parts = ['<div class="section"><h2 class="section-title">👥 Group Analysis</h2>']
+        parts.append('<table><thead><tr><th>Rank</th><th>Group Name</th><th>Total Messages</th>')
+        parts.append('<th>First Message</th><th>Last Message</th></tr></thead><tbody>')
         
-        for idx, row in groups_df.head(20).iterrows():
-            first_msg = row.get('first_message', '')
-            last_msg = row.get('last_message', '')
-            
-            if pd.notna(first_msg) and hasattr(first_msg, 'strftime'):
-                first_msg = first_msg.strftime('%Y-%m-%d')
-            if pd.notna(last_msg) and hasattr(last_msg, 'strftime'):
-                last_msg = last_msg.strftime('%Y-%m-%d')
-            
-            html += f'''<tr>
-                <td>{idx + 1}</td>
-                <td><strong>{row.get("group_name", "Unknown")}</strong></td>
-                <td>{row.get("total_messages", 0):,}</td>
-                <td>{first_msg}</td>
-                <td>{last_msg}</td>
-            </tr>'''
+        top = groups_df.head(20)
+        rows = zip(top.index + 1, top['group_name'], self._format_counts(top['total_messages']),
+                   self._format_dates(top['first_message']), self._format_dates(top['last_message']))
+        keys = ('rank', 'group_name', 'total', 'first_msg', 'last_msg')
+        for row in rows:
+            parts.append(_GROUP_ROW_TMPL.format_map(dict(zip(keys, row))))
         
-        html += '</tbody></table></div>'
-        return html
+        parts.append('</tbody></table></div>')
+        return ''.join(parts)
     
     def _generate_media_senders_table(self, media_df):
         """Top media senders table"""
         if media_df.empty:
             return ''
         
-        html = '<h3 style="color: #34B7F1; margin-top: 30px;">Top Media Senders</h3>'
-        html += '<table><thead><tr><th>Rank</th><th>Contact</th><th>🖼️ Photos</th><th>🎵 Audio</th><th>🎥 Videos</th><th>📊 Total</th></tr></thead><tbody>'
+        parts = ['<h3 style="color: #34B7F1; margin-top: 30px;">Top Media Senders</h3>']
+        parts.append('<table><thead><tr><th>Rank</th><th>Contact</th><th>🖼️ Photos</th><th>🎵 Audio</th><th>🎥 Videos</th><th>📊 Total</th></tr></thead><tbody>')
         
-        for idx, row in media_df.head(10).iterrows():
-            contact_name = row.get('contact_name', 'Unknown')
-            
-            # If contact_name still looks like ID, get name from chat_id
-            if pd.notna(contact_name) and (contact_name == 'Unknown' or '@' in str(contact_name) or str(contact_name).isdigit()):
-                chat_id = row.get('chat_id', contact_name)
-                contact_name = self.analyzer.get_contact_name(chat_id)
-            
-            images = int(row.get('images', 0))
-            audio = int(row.get('audio', 0))
-            videos = int(row.get('videos', 0))
-            total = int(row.get('total_media', 0))
-            
-            html += f'''<tr>
-                <td>{idx + 1}</td>
-                <td><strong>{contact_name}</strong></td>
-                <td>{images:,}</td>
-                <td>{audio:,}</td>
-                <td>{videos:,}</td>
-                <td style="color: #25D366; font-weight: bold;">{total:,}</td>
-            </tr>'''
+        top = media_df.head(10)
+        
+        # If contact_name still looks like ID, get name from chat_id (checked column-wise, NA never matches)
+        name_str = top['contact_name'].fillna('').astype(str)
+        looks_like_id = (name_str.eq('Unknown') | name_str.str.contains('@', regex=False) | name_str.str.isdigit()).to_numpy()
+        names = [
+            self._contact_name(chat_id) if is_id else name
+            for chat_id, name, is_id in zip(top['chat_id'], top['contact_name'], looks_like_id)
+        ]
         
-        html += '</tbody></table>'
-        return html
+        rows = zip(top.index + 1, names, self._format_counts(top['images']), self._format_counts(top['audio']),
+                   self._format_counts(top['videos']), self._format_counts(top['total_media']))
+        keys = ('rank', 'contact_name', 'images', 'audio', 'videos', 'total')
+        for row in rows:
+            parts.append(_MEDIA_ROW_TMPL.format_map(dict(zip(keys, row))))
+        
+        parts.append('</tbody></table>')
+        return ''.join(parts)
     
-    def _generate_word_analysis_section(self, word_freq_df, wordcloud_img, msg_length):
+    def _generate_word_analysis_section(self, word_freq_df, wordcloud_html, msg_length):
         """Word analysis section"""
-        html = '<div class="section"><h2 class="section-title">📖 Word Analysis</h2>'
+        parts = ['<div class="section"><h2 class="section-title">📖 Word Analysis</h2>']
         
         # Message length statistics
         if msg_length:
-            html += '<div class="stats-grid">'
-            html += f'<div class="stat-card"><h3>Average Length</h3><div class="value">{msg_length.get("average_length", 0):.1f}</div><div class="label">characters</div></div>'
-            html += f'<div class="stat-card"><h3>Median Length</h3><div class="value">{msg_length.get("median_length", 0):.1f}</div><div class="label">characters</div></div>'
-            html += f'<div class="stat-card"><h3>Longest Message</h3><div class="value">{msg_length.get("max_length", 0):,}</div><div class="label">characters</div></div>'
-            html += '</div>'
+            parts.append('<div class="stats-grid">')
+            parts.append(f'<div class="stat-card"><h3>Average Length</h3><div class="value">{msg_length.get("average_length", 0):.1f}</div><div class="label">characters</div></div>')
+            parts.append(f'<div class="stat-card"><h3>Median Length</h3><div class="value">{msg_length.get("median_length", 0):.1f}</div><div class="label">characters</div></div>')
+            parts.append(f'<div class="stat-card"><h3>Longest Message</h3><div class="value">{msg_length.get("max_length", 0):,}</div><div class="label">characters</div></div>')
+            parts.append('</div>')
         
         # Word cloud
-        if wordcloud_img:
-            html += '<h3 style="color: #34B7F1; margin-top: 30px;">Word Cloud</h3>'
-            html += f'<div class="wordcloud-container"><img src="{wordcloud_img}" alt="Word Cloud"></div>'
+        if wordcloud_html:
+            parts.append('<h3 style="color: #34B7F1; margin-top: 30px;">Word Cloud</h3>')
+            parts.append(f'<div class="wordcloud-container">{wordcloud_html}</div>')
         
         # Most used words
         if not word_freq_df.empty:
-            html += '<h3 style="color: #34B7F1; margin-top: 30px;">Most Used Words</h3>'
-            html += '<table><thead><tr><th>Rank</th><th>Word</th><th>Frequency</th></tr></thead><tbody>'
+            parts.append('<h3 style="color: #34B7F1; margin-top: 30px;">Most Used Words</h3>')
+            parts.append('<table><thead><tr><th>Rank</th><th>Word</th><th>Frequency</th></tr></thead><tbody>')
             
-            for idx, row in word_freq_df.head(30).iterrows():
-                html += f'''<tr>
-                    <td>{idx + 1}</td>
-                    <td><strong>{row["word"]}</strong></td>
-                    <td>{row["frequency"]:,}</td>
-                </tr>'''
+            top_words = word_freq_df.head(30)
+            rows = zip(top_words.index + 1, top_words['word'].values, self._format_counts(top_words['frequency']))
+            for rank, word, freq in rows:
+                parts.append(_WORD_ROW_TMPL.format(rank=rank, word=word, freq=freq))
             
-            html += '</tbody></table>'
+            parts.append('</tbody></table>')
         
-        html += '</div>'
-        return html
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _generate_emoji_section(self, emoji_df):
         """Emoji analysis section"""
         if emoji_df.empty:
             return ''
         
-        html = '<div class="section"><h2 class="section-title">😊 Emoji Analysis</h2>'
-        html += f'<p>Total <strong>{emoji_df["frequency"].sum():,}</strong> emojis used</p>'
-        html += '<div class="emoji-grid">'
+        parts = ['<div class="section"><h2 class="section-title">😊 Emoji Analysis</h2>']
+        parts.append(f'<p>Total <strong>{emoji_df["frequency"].sum():,}</strong> emojis used</p>')
+        parts.append('<div class="emoji-grid">')
         
-        for _, row in emoji_df.head(30).iterrows():
-            html += f'''<div class="emoji-item">
-                <div class="emoji">{row["emoji"]}</div>
-                <div class="count">{row["frequency"]:,}</div>
-            </div>'''
+        top_emojis = emoji_df.head(30)
+        for emoji, freq in zip(top_emojis['emoji'].values, self._format_counts(top_emojis['frequency'])):
+            parts.append(f'''<div class="emoji-item">
+                <div class="emoji">{emoji}</div>
+                <div class="count">{freq}</div>
+            </div>''')
         
-        html += '</div></div>'
-        return html
+        parts.append('</div></div>')
+        return ''.join(parts)
     
     def _generate_message_details_section(self, longest_msgs, recent_msgs, first_msgs, response_stats):
         """Message details section"""
-        html = '<div class="section"><h2 class="section-title">💬 Message Details</h2>'
+        parts = ['<div class="section"><h2 class="section-title">💬 Message Details</h2>']
         
         # Response times
         if response_stats:
-            html += '<h3 style="color: #34B7F1;">⏱️ Response Times</h3>'
-            html += '<div class="stats-grid">'
-            html += f'<div class="stat-card"><h3>Average</h3><div class="value">{response_stats.get("avg_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>'
-            html += f'<div class="stat-card"><h3>Median</h3><div class="value">{response_stats.get("median_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>'
-            html += f'<div class="stat-card"><h3>Fastest</h3><div class="value">{response_stats.get("min_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>'
-            html += f'<div class="stat-card"><h3>Slowest</h3><div class="value">{response_stats.get("max_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>'
-            html += '</div>'
+            parts.append('<h3 style="color: #34B7F1;">⏱️ Response Times</h3>')
+            parts.append('<div class="stats-grid">')
+            parts.append(f'<div class="stat-card"><h3>Average</h3><div class="value">{response_stats.get("avg_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>')
+            parts.append(f'<div class="stat-card"><h3>Median</h3><div class="value">{response_stats.get("median_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>')
+            parts.append(f'<div class="stat-card"><h3>Fastest</h3><div class="value">{response_stats.get("min_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>')
+            parts.append(f'<div class="stat-card"><h3>Slowest</h3><div class="value">{response_stats.get("max_response_time_minutes", 0):.1f}</div><div class="label">minutes</div></div>')
+            parts.append('</div>')
         
         # Longest messages
         if not longest_msgs.empty:
-            html += '<h3 style="color: #34B7F1; margin-top: 30px;">📏 Longest Messages</h3>'
-            html += '<div style="max-height: 400px; overflow-y: auto;">'
-            for idx, row in longest_msgs.iterrows():
-                text = str(row.get('text', ''))[:300]  # First 300 characters
-                html += f'''<div style="background: #252525; padding: 15px; margin: 10px 0; border-radius: 10px; border-left: 3px solid #25D366;">
-                    <div style="color: #888; font-size: 0.9em; margin-bottom: 5px;">Length: {row.get('length', 0)} characters</div>
-                    <div style="color: #e0e0e0;">{text}...</div>
-                </div>'''
-            html += '</div>'
-        
-        # Recent messages
+            parts.append('<h3 style="color: #34B7F1; margin-top: 30px;">📏 Longest Messages</h3>')
+            parts.append('<div style="max-height: 400px; overflow-y: auto;">')
+            texts = longest_msgs['text'].astype(str).str.slice(0, 300)  # First 300 characters
+            for length, text in zip(longest_msgs['length'].to_numpy(), texts.to_numpy()):
+                parts.append(_LONGEST_MSG_TMPL.format(length=length, text=text))
+            parts.append('</div>')
+        
+        # Recent / first messages
         if not recent_msgs.empty:
-            html += '<h3 style="color: #34B7F1; margin-top: 30px;">🕐 Last Message from Each Contact</h3>'
-            html += '<p style="color: #888; margin-bottom: 15px;">Your last message with each user</p>'
-            html += '<div style="max-height: 500px; overflow-y: auto;">'
-            for idx, row in recent_msgs.head(20).iterrows():
-                from_me = row.get('from_me', 0)
-                direction = "→ Sent" if from_me == 1 else "← Received"
-                color = "#25D366" if from_me == 1 else "#34B7F1"
-                
-                chat_id = row.get('chat_id', 'Unknown')
-                contact_name = self.analyzer.get_contact_name(chat_id)
-                
-                msg_text = str(row.get('message_text', ''))[:200] if pd.notna(row.get('message_text')) else '[Media]'
-                datetime_str = row.get('datetime').strftime('%Y-%m-%d %H:%M:%S') if pd.notna(row.get('datetime')) else ''
-                
-                html += f'''<div style="background: #252525; padding: 12px; margin: 8px 0; border-radius: 8px; border-left: 3px solid {color};">
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                        <span style="color: {color}; font-weight: bold;">{contact_name}</span>
-                        <span style="color: #888; font-size: 0.85em;">{datetime_str}</span>
-                    </div>
-                    <div style="color: #888; font-size: 0.85em; margin-bottom: 5px;">{direction}</div>
-                    <div style="color: #e0e0e0;">{msg_text}</div>
-                </div>'''
-            html += '</div>'
-        
-        # First messages
+            parts.append(self._render_message_card_list(
+                recent_msgs, 20, '🕐 Last Message from Each Contact', 'Your last message with each user', 500))
         if not first_msgs.empty:
-            html += '<h3 style="color: #34B7F1; margin-top: 30px;">📅 First Message from Each Contact</h3>'
-            html += '<p style="color: #888; margin-bottom: 15px;">Your first message with each user</p>'
-            html += '<div style="max-height: 400px; overflow-y: auto;">'
-            for idx, row in first_msgs.head(15).iterrows():
-                from_me = row.get('from_me', 0)
-                direction = "→ Sent" if from_me == 1 else "← Received"
-                color = "#25D366" if from_me == 1 else "#34B7F1"
-                
-                chat_id = row.get('chat_id', 'Unknown')
-                contact_name = self.analyzer.get_contact_name(chat_id)
-                
-                msg_text = str(row.get('message_text', ''))[:200] if pd.notna(row.get('message_text')) else '[Media]'
-                datetime_str = row.get('datetime').strftime('%Y-%m-%d %H:%M:%S') if pd.notna(row.get('datetime')) else ''
-                
-                html += f'''<div style="background: #252525; padding: 12px; margin: 8px 0; border-radius: 8px; border-left: 3px solid {color};">
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                        <span style="color: {color}; font-weight: bold;">{contact_name}</span>
-                        <span style="color: #888; font-size: 0.85em;">{datetime_str}</span>
-                    </div>
-                    <div style="color: #888; font-size: 0.85em; margin-bottom: 5px;">{direction}</div>
-                    <div style="color: #e0e0e0;">{msg_text}</div>
-                </div>'''
-            html += '</div>'
+            parts.append(self._render_message_card_list(
+                first_msgs, 15, '📅 First Message from Each Contact', 'Your first message with each user', 400))
         
-        html += '</div>'
-        return html
+        parts.append('</div>')
+        return ''.join(parts)
+    
+    def _render_message_card_list(self, msgs_df, limit, title, subtitle, max_height):
+        """One message card per contact (shared by the recent / first message lists)"""
+        parts = [f'<h3 style="color: #34B7F1; margin-top: 30px;">{title}</h3>',
+                 f'<p style="color: #888; margin-bottom: 15px;">{subtitle}</p>',
+                 f'<div style="max-height: {max_height}px; overflow-y: auto;">']
+        msgs = msgs_df.head(limit)
+        texts = msgs['message_text'].astype(str).str.slice(0, 200).where(msgs['message_text'].notna(), '[Media]')
+        datetimes = self._format_dates(msgs['datetime'], '%Y-%m-%d %H:%M:%S')
+        sent = (msgs['from_me'] == 1).astype(int).tolist()
+        rows = zip(msgs['chat_id'].to_numpy(), sent, texts.to_numpy(), datetimes.to_numpy())
+        for chat_id, from_me, msg_text, datetime_str in rows:
+            parts.append(_MESSAGE_CARD_TMPL.format(color=_DIRECTION_COLOR[from_me], contact_name=self._contact_name(chat_id),
+                                                   datetime=datetime_str, direction=_DIRECTION[from_me], text=msg_text))
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _generate_conversation_details_section(self, top_contacts_df):
         """Contact-based conversation details - WhatsApp Web style"""
         if top_contacts_df.empty:
             return ''
         
-        html = '<div class="section"><h2 class="section-title">💬 WhatsApp Web - Conversations</h2>'
-        html += '<p style="margin-bottom: 20px;">Select a contact from the left, see the conversation on the right</p>'
+        parts = ['<div class="section"><h2 class="section-title">💬 WhatsApp Web - Conversations</h2>']
+        parts.append('<p style="margin-bottom: 20px;">Select a contact from the left, see the conversation on the right</p>')
         
         # WhatsApp Web style container
-        html += '<div class="whatsapp-container">'
+        parts.append('<div class="whatsapp-container">')
         
         # Left side - Contact list
-        html += '<div class="contacts-sidebar">'
-        html += '<div style="padding: 20px; background: #128C7E; color: white; font-weight: bold;">Conversations</div>'
-        
-        # Conversation data for JavaScript
-        conversations_data = {}
+        parts.append('<div class="contacts-sidebar">')
+        parts.append('<div style="padding: 20px; background: #128C7E; color: white; font-weight: bold;">Conversations</div>')
+        
+        # Conversation data for JavaScript (one pre-serialized JSON fragment per contact)
+        conversation_json = []
+        
+        # Details and last 200 messages of every listed contact, fetched in one go
+        top = top_contacts_df.head(15)
+        chat_ids = top['chat_id'].tolist()
+        all_details = self.analyzer.get_conversation_details_for_contacts(chat_ids)
+        all_conversations = self.analyzer.get_conversations_for_contacts(chat_ids, per_chat_limit=200)
+        conversations = {}
+        if not all_conversations.empty:
+            conversations = dict(tuple(all_conversations.groupby('chat_id', observed=True, sort=False)))
+            # Son mesaj önizlemesi, tek seferde kesilir
+            last_rows = all_conversations.drop_duplicates('chat_id', keep='last')
+            last_texts = last_rows['message_text']
+            previews = last_texts.astype(str).str.slice(0, 50).where(last_texts.notna(), '[Medya]')
+            last_previews = dict(zip(last_rows['chat_id'], previews))
+        else:
+            last_previews = {}
         
         # Create contact list item for each person
-        for idx, row in top_contacts_df.head(15).iterrows():
-            chat_id = row.get('chat_id', '')
-            contact_name = row.get('contact_name', 'Unknown')
-            total_messages = row.get('total_messages', 0)
+        rows = zip(top.index, top['chat_id'], top['contact_name'], self._format_counts(top['total_messages']))
+        for idx, chat_id, contact_name, total_messages in rows:
             
             # Get detailed information
-            details = self.analyzer.get_conversation_details_for_contact(chat_id)
+            details = all_details.get(chat_id)
             
             if not details:
                 continue
             
             # Last message preview
-            conversation = self.analyzer.get_conversation_with_contact(chat_id, limit=200)
+            conversation = conversations.get(chat_id, pd.DataFrame())
             
-            last_msg_preview = ""
-            if not conversation.empty:
-                last_msg = conversation.iloc[-1]
-                last_msg_text = str(last_msg.get('message_text', ''))[:50] if pd.notna(last_msg.get('message_text')) else '[Medya]'
-                last_msg_preview = last_msg_text
+            last_msg_preview = last_previews.get(chat_id, "")
             
             # Contact list item
             contact_id = f"contact_{idx}"
             active_class = "active" if idx == 0 else ""
             
-            html += f'''<div class="contact-item {active_class}" onclick="showConversation('{contact_id}')">
+            parts.append(f'''<div class="contact-item {active_class}" onclick="showConversation('{contact_id}', this)">
                 <div class="name">{contact_name}</div>
                 <div class="preview">{last_msg_preview}</div>
-                <div class="count">{total_messages:,} messages</div>
-            </div>'''
+                <div class="count">{total_messages} messages</div>
+            </div>''')
             
-            # Store conversation data (convert datetimes to strings)
+            # Store conversation data (convert datetimes to strings; NaN average of media-only chats -> 0)
+            avg_length = float(details.get('avg_message_length', 0))
             details_json = {
                 'total_messages': details.get('total_messages', 0),
                 'sent_by_me': details.get('sent_by_me', 0),
@@ -1071,157 +1270,42 @@ class ReportGenerator:
                 'media_count': details.get('media_count', 0),
                 'first_message': str(details.get('first_message', 'N/A')),
                 'last_message': str(details.get('last_message', 'N/A')),
-                'avg_message_length': float(details.get('avg_message_length', 0)),
-            }
-            
-            conversations_data[contact_id] = {
-                'name': contact_name,
-                'details': details_json,
-                'messages': []
+                'avg_message_length': avg_length if np.isfinite(avg_length) else 0.0,
             }
             
-            # Prepare messages in JSON format
+            # Messages column-wise (one list per field) so the keys are not repeated per message;
+            # text is HTML-escaped here once, not in the browser
+            from_me, msg_texts, media_types, times = [], [], [], []
             if not conversation.empty:
-                for _, msg in conversation.iterrows():
-                    from_me = int(msg.get('from_me', 0))
-                    msg_text = str(msg.get('message_text', ''))[:500] if pd.notna(msg.get('message_text')) else None
-                    media_type = msg.get('media_type', 0)
-                    datetime_str = msg.get('datetime').strftime('%Y-%m-%d %H:%M') if pd.notna(msg.get('datetime')) else ''
-                    
-                    conversations_data[contact_id]['messages'].append({
-                        'from_me': from_me,
-                        'text': msg_text,
-                        'media_type': int(media_type) if pd.notna(media_type) else 0,
-                        'time': datetime_str
-                    })
-        
-        html += '</div>'  # contacts-sidebar sonu
-        
-        # Right side - Chat area
-        html += '<div class="chat-area">'
-        html += '<div class="chat-header" id="chatHeader">'
-        
-        # Show first contact
-        if conversations_data:
-            first_contact = list(conversations_data.keys())[0]
-            first_data = conversations_data[first_contact]
-            html += f'''<div class="name">{first_data['name']}</div>
-                <div class="info">
-                    {first_data['details'].get('total_messages', 0)} messages • 
-                    Sent: {first_data['details'].get('sent_by_me', 0)} • 
-                    Received: {first_data['details'].get('received', 0)} • 
-                    Media: {first_data['details'].get('media_count', 0)}
-                </div>'''
-        
-        html += '</div>'
-        
-        # Message area
-        html += '<div class="chat-messages" id="chatMessages">'
-        
-        # Show first contact's messages
-        if conversations_data:
-            first_contact = list(conversations_data.keys())[0]
-            first_messages = conversations_data[first_contact]['messages']
-            
-            for msg in first_messages:
-                msg_class = "sent" if msg['from_me'] == 1 else "received"
-                
-                if msg['text']:
-                    msg_text = msg['text'].replace('<', '&lt;').replace('>', '&gt;')
-                else:
-                    media_types = {0: 'Text', 1: '🖼️ Photo', 2: '🎵 Audio', 3: '🎥 Video', 
-                                  4: '👤 Contact', 5: '📍 Location', 9: '📄 Document', 13: 'GIF', 20: '🎨 Sticker'}
-                    msg_text = f'<span class="media-indicator">{media_types.get(msg["media_type"], "Media")}</span>'
-                
-                html += f'''<div class="message-bubble {msg_class}">
-                    <div class="message-content">
-                        <div class="message-text">{msg_text}</div>
-                        <div class="message-time">{msg['time']}</div>
-                    </div>
-                </div>'''
-        
-        html += '</div>'  # chat-messages sonu
-        html += '</div>'  # chat-area sonu
-        html += '</div>'  # whatsapp-container sonu
-        
-        # JavaScript kodu
-        html += '''
-        <script>
-        // Konuşma verileri
-        const conversationsData = ''' + json.dumps(conversations_data, ensure_ascii=False) + ''';
-        
-        function showConversation(contactId) {
-            // Remove active class from all contacts
-            document.querySelectorAll('.contact-item').forEach(item => {
-                item.classList.remove('active');
-            });
-            
-            // Make clicked contact active
-            event.currentTarget.classList.add('active');
-            
-            // Get conversation data
-            const data = conversationsData[contactId];
-            if (!data) return;
-            
-            // Update header
-            const header = document.getElementById('chatHeader');
-            header.innerHTML = `
-                <div class="name">${data.name}</div>
-                <div class="info">
-                    ${data.details.total_messages} messages • 
-                    Sent: ${data.details.sent_by_me} • 
-                    Received: ${data.details.received} • 
-                    Media: ${data.details.media_count}
-                </div>
-            `;
-            
-            // Update messages
-            const messagesArea = document.getElementById('chatMessages');
-            messagesArea.innerHTML = '';
-            
-            const mediaTypes = {
-                0: 'Text', 1: '🖼️ Photo', 2: '🎵 Audio', 3: '🎥 Video',
-                4: '👤 Contact', 5: '📍 Location', 9: '📄 Document', 13: 'GIF', 20: '🎨 Sticker'
-            };
+                texts = conversation['message_text']
+                safe_texts = texts.astype(str).str.slice(0, 500).map(_escape_text, na_action='ignore')
+                from_me = conversation['from_me'].to_numpy(dtype=int).tolist()
+                msg_texts = np.where(texts.notna().to_numpy(), safe_texts.to_numpy(dtype=object), None).tolist()
+                media_types = conversation['media_type'].fillna(0).to_numpy(dtype=int).tolist()
+                times = self._format_dates(conversation['datetime'], '%Y-%m-%d %H:%M').tolist()
             
-            data.messages.forEach(msg => {
-                const msgClass = msg.from_me === 1 ? 'sent' : 'received';
-                let msgText;
-                
-                if (msg.text) {
-                    msgText = msg.text.replace(/</g, '&lt;').replace(/>/g, '&gt;');
-                } else {
-                    const mediaType = mediaTypes[msg.media_type] || 'Medya';
-                    msgText = `<span class="media-indicator">${mediaType}</span>`;
-                }
-                
-                const bubble = document.createElement('div');
-                bubble.className = `message-bubble ${msgClass}`;
-                bubble.innerHTML = `
-                    <div class="message-content">
-                        <div class="message-text">${msgText}</div>
-                        <div class="message-time">${msg.time}</div>
-                    </div>
-                `;
-                messagesArea.appendChild(bubble);
-            });
-            
-            // En alta scroll
-            messagesArea.scrollTop = messagesArea.scrollHeight;
-        }
-        
-        // Show first conversation on page load
-        window.addEventListener('DOMContentLoaded', () => {
-            const chatMessages = document.getElementById('chatMessages');
-            if (chatMessages) {
-                chatMessages.scrollTop = chatMessages.scrollHeight;
-            }
-        });
-        </script>
-        '''
-        
-        html += '</div>'  # section sonu
-        return html
+            conversation_json.append(_CONVERSATION_JSON_TMPL.format(
+                id=contact_id, name=_dumps_compact(contact_name), details=_dumps_compact(details_json),
+                from_me=_dumps_compact(from_me), text=_dumps_compact(msg_texts),
+                media_type=_dumps_compact(media_types), time=_dumps_compact(times)))
+        
+        parts.append('</div>')  # contacts-sidebar sonu
+        
+        # Right side - Chat area (ilk kişi sayfa yüklenince JS ile çizilir)
+        parts.append('<div class="chat-area">')
+        parts.append('<div class="chat-header" id="chatHeader"></div>')
+        parts.append('<div class="chat-messages" id="chatMessages"></div>')
+        parts.append('</div>')  # chat-area sonu
+        parts.append('</div>')  # whatsapp-container sonu
+        
+        # Konuşma verileri: JSON.parse string literal'i büyük nesnelerde JS parser'ından hızlı
+        payload = '{' + ','.join(conversation_json) + '}'
+        payload = payload.replace('\\', '\\\\').replace("'", "\\'").replace('</', '<\\/')
+        parts.append(f"<script>window.__convs=JSON.parse('{payload}');</script>\n")
+        parts.append(_CONVERSATIONS_JS)
+        
+        parts.append('</div>')  # section sonu
+        return ''.join(parts)
 
 
 def test_report_generator():